@@ -56,6 +56,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "userApp.middleware.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "Student_Mental_Health.urls"
@@ -90,10 +91,61 @@ DATABASES = {
 
 database_url = os.environ.get("DATABASE_URL")
 
+# Persistent connections: reuse each worker's connection for DB_CONN_MAX_AGE
+# seconds (0 closes it after every request) and ping it before reuse
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+
+if database_url:
+    DATABASES["default"] = dj_database_url.parse(
+        database_url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # DB_POOL=True uses Django's psycopg 3 connection pool (requires
+    # `psycopg[pool]`); Django rejects persistent connections alongside it
+    if os.environ.get("DB_POOL", "False") == "True":
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        }
+
+    # Behind PgBouncer in transaction pooling mode server-side cursors break,
+    # so DB_PGBOUNCER=True turns them off (keep DB_CONN_MAX_AGE > 0)
+    if os.environ.get("DB_PGBOUNCER", "False") == "True":
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Opt-in SQLite profile for concurrent gunicorn workers: WAL lets readers run
+# alongside a writer and busy_timeout waits for the lock instead of raising
+# "database is locked". The pragmas are applied in userApp.signals.
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "False") == "True"
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", "20000")),
+}
 
+if SQLITE_TUNING and DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Take the write lock at BEGIN so busy_timeout applies instead of failing
+    # when a read transaction later tries to upgrade to a write
+    DATABASES["default"].setdefault("OPTIONS", {})["transaction_mode"] = "IMMEDIATE"
 
-DATABASES["default"]= dj_database_url.parse(database_url)
-
+# Default cache, also holding rate limiter state. LocMemCache is per process;
+# to share state across gunicorn workers use a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache with a
+# directory, or ...db.DatabaseCache with a table (run createcachetable)
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
 
 
 # Password validation
@@ -136,7 +188,8 @@ USE_TZ = True
 
 STATIC_URL = 'static/' # below this add the following line
 STATICFILES_DIRS = [os.path.join(BASE_DIR,'static')]
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+# collectstatic's output; it cannot be the source directory above
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -149,8 +202,119 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Session storage: "db" (Django's default, a query per request), "cached_db"
+# (reads served from the default cache, writes still go to the database) or
+# "signed_cookies" (no server-side state; session data must stay small).
+# cached_db needs a cache shared by all workers (see CACHE_BACKEND): with a
+# per-process locmem cache a worker can serve a session another has changed.
+SESSION_STRATEGY = os.environ.get("SESSION_STRATEGY", "db")
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}[SESSION_STRATEGY]
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Assessment retention for `manage.py purge_responses`: responses older than
+# RETENTION_DAYS (0 keeps them forever) are deleted with their predictions,
+# or with RETENTION_MODE=anonymize only unlinked from their user account
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "0"))
+RETENTION_MODE = os.environ.get("RETENTION_MODE", "delete")
+
+# Model artifacts (scaler, feature selector, MultiOutput AdaBoost). The version
+# stored on each Prediction defaults to a hash of the artifact files.
+ML_MODEL_DIR = os.environ.get("ML_MODEL_DIR", os.path.join(BASE_DIR, "userApp", "Ml_models"))
+ML_MODEL_VERSION = os.environ.get("ML_MODEL_VERSION", "")
+# Encoded copies of Dataset.csv (and other CSV sources) as .npz, keyed by content hash
+DATASET_CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", os.path.join(BASE_DIR, ".ml_cache"))
+# Inference backend: adaboost, hist_gradient_boosting or xgboost (see userApp.backends)
+ML_BACKEND = os.environ.get("ML_BACKEND", "adaboost")
+
+# Inference micro-batching: concurrent single-row predictions are coalesced
+# for up to INFERENCE_BATCH_WINDOW_MS or INFERENCE_BATCH_MAX_SIZE rows (a lone
+# row is scored at once); a caller waiting INFERENCE_BATCH_TIMEOUT_MS predicts directly
+INFERENCE_BATCHING = os.environ.get("INFERENCE_BATCHING", "True") == "True"
+INFERENCE_BATCH_WINDOW_MS = float(os.environ.get("INFERENCE_BATCH_WINDOW_MS", "2"))
+INFERENCE_BATCH_MAX_SIZE = int(os.environ.get("INFERENCE_BATCH_MAX_SIZE", "32"))
+INFERENCE_BATCH_TIMEOUT_MS = float(os.environ.get("INFERENCE_BATCH_TIMEOUT_MS", "1000"))
+
+# Warm the model, lookup indexes, templates and database connection in the
+# background when a server process starts; /readyz returns 503 until done
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "True") == "True"
+
+# Staff can profile one request with an X-Profile header or ?_profile=1
+# (?_profile=inline returns the report instead of the page); reports keep
+# the top PROFILING_TOP_N functions and allocation sites
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "True") == "True"
+PROFILING_TOP_N = int(os.environ.get("PROFILING_TOP_N", "25"))
+PROFILING_TRACEBACK_DEPTH = int(os.environ.get("PROFILING_TRACEBACK_DEPTH", "1"))
+
+# Shadow mode: a candidate artifact set in SHADOW_MODEL_DIR scores a
+# SHADOW_SAMPLE_RATE share of live submissions in the background; up to
+# SHADOW_QUEUE_SIZE submissions wait for it, more are dropped
+SHADOW_MODEL_DIR = os.environ.get("SHADOW_MODEL_DIR", "")
+SHADOW_BACKEND = os.environ.get("SHADOW_BACKEND", ML_BACKEND)
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_QUEUE_SIZE = int(os.environ.get("SHADOW_QUEUE_SIZE", "256"))
+
+# Per-process input drift monitor against Dataset.csv, served at /metrics/drift/
+DRIFT_MONITORING = os.environ.get("DRIFT_MONITORING", "True") == "True"
+
+# Score percentiles are ranked against Dataset.csv scored by the loaded model,
+# plus stored predictions from the same model version re-read this often (0: never)
+PERCENTILE_REFRESH_SECONDS = int(os.environ.get("PERCENTILE_REFRESH_SECONDS", "3600"))
+
+# "Students like you": neighbours aggregated per lookup (0 disables the index)
+# and how often stored responses are re-read into it
+SIMILAR_PROFILES_K = int(os.environ.get("SIMILAR_PROFILES_K", "25"))
+SIMILAR_PROFILES_REFRESH_SECONDS = int(os.environ.get("SIMILAR_PROFILES_REFRESH_SECONDS", "3600"))
+
+# Assessment results are shown at /result/<id>/ after a redirect. Results
+# without a stored response (anonymous visitors) are kept for RESULT_CACHE_TTL
+# seconds, then deleted by purge_responses; browsers may reuse a result page
+# for RESULT_PAGE_MAX_AGE seconds, then revalidate it
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "86400"))
+RESULT_PAGE_MAX_AGE = int(os.environ.get("RESULT_PAGE_MAX_AGE", "300"))
+
+# Repeated assessment forms (same submission token and answers) and /predict/
+# requests (same Idempotency-Key header and body) get the first result back
+# for IDEMPOTENCY_TTL seconds instead of being scored and stored again. The
+# claims live in the default cache, so several workers need a shared one
+IDEMPOTENCY_ENABLED = os.environ.get("IDEMPOTENCY_ENABLED", "True") == "True"
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", "600"))
+
+# Token buckets per user (or client IP) for prediction requests: single-row
+# scoring and batch rows have separate budgets of RATE tokens per second, up
+# to BURST tokens. Batches cost one token per row.
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "True") == "True"
+RATE_LIMITS = {
+    "single": (
+        float(os.environ.get("RATE_LIMIT_SINGLE_RATE", "0.5")),
+        int(os.environ.get("RATE_LIMIT_SINGLE_BURST", "20")),
+    ),
+    "batch": (
+        float(os.environ.get("RATE_LIMIT_BATCH_RATE", "50")),
+        int(os.environ.get("RATE_LIMIT_BATCH_BURST", "1000")),
+    ),
+}
+# Only trust X-Forwarded-For when a proxy you control sets it
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = os.environ.get("RATE_LIMIT_TRUST_X_FORWARDED_FOR", "False") == "True"
+
+# Largest JSON array /predict/ scores in one request
+PREDICT_API_MAX_BATCH_SIZE = int(os.environ.get("PREDICT_API_MAX_BATCH_SIZE", "500"))
+
+# Largest counterfactual grid /predict/whatif/ scores in one request. Grids
+# spend one batch token per variant, so the cap never exceeds the batch burst
+WHATIF_MAX_VARIANTS = min(
+    int(os.environ.get("WHATIF_MAX_VARIANTS", "1000")),
+    RATE_LIMITS["batch"][1],
+)
+
+# Encode optional /predict/ extras (e.g. contributions) with orjson, which
+# must be installed; it writes compact JSON, so those keys lose their spaces
+FAST_JSON = os.environ.get("FAST_JSON", "False") == "True"
+
 # settings.py
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
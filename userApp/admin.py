@@ -1,5 +1,154 @@
+import csv
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .choices import CATEGORICAL_FIELDS
+from .insights import LEVEL_THRESHOLDS
 from .models import UserResponse, Prediction
 
-admin.site.register(UserResponse)
-admin.site.register(Prediction)
\ No newline at end of file
+# Above this many rows an unfiltered changelist shows the planner's estimate
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips COUNT(*) on large unfiltered PostgreSQL tables and
+    uses the row estimate in pg_class instead. Filtered lists and other
+    databases are counted as usual.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+class Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filename, header, rows):
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in _with_header(header, rows)),
+        content_type='text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _with_header(header, rows):
+    yield header
+    yield from rows
+
+
+def score_band_filter(field, key):
+    """Changelist filter on the Low/Moderate/High band of one score field"""
+    low, high = LEVEL_THRESHOLDS[key]
+
+    class ScoreBandFilter(admin.SimpleListFilter):
+        title = f'{key} level'
+        parameter_name = f'{key}_band'
+
+        def lookups(self, request, model_admin):
+            return [('low', 'Low'), ('moderate', 'Moderate'), ('high', 'High')]
+
+        def queryset(self, request, queryset):
+            bands = {
+                'low': {f'{field}__lt': low},
+                'moderate': {f'{field}__gte': low, f'{field}__lt': high},
+                'high': {f'{field}__gte': high},
+            }
+            if self.value() in bands:
+                return queryset.filter(**bands[self.value()])
+            return queryset
+
+    return ScoreBandFilter
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the extra unfiltered COUNT(*) shown next to filtered results
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(UserResponse)
+class UserResponseAdmin(ScalableAdmin):
+    list_display = [
+        'id', 'user', 'submitted_at', 'age', 'gender', 'course', 'sleep_quality', 'social_support',
+        'financial_stress',
+    ]
+    list_filter = ['submitted_at', 'course', 'gender']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    search_fields = ['=id', 'user__username']
+    actions = ['export_csv']
+
+    @admin.action(description="Export selected responses as CSV")
+    def export_csv(self, request, queryset):
+        fields = [field.attname for field in UserResponse._meta.concrete_fields]
+        labels = {
+            i: dict(CATEGORICAL_FIELDS[field].choices)
+            for i, field in enumerate(fields) if field in CATEGORICAL_FIELDS
+        }
+
+        def rows():
+            for values in queryset.order_by('pk').values_list(*fields).iterator(chunk_size=2000):
+                row = list(values)
+                for i, choices in labels.items():
+                    if row[i] is not None:
+                        row[i] = choices[row[i]]
+                yield row
+
+        return stream_csv(f'user_responses_{timezone.now():%Y%m%d-%H%M%S}.csv', fields, rows())
+
+
+@admin.register(Prediction)
+class PredictionAdmin(ScalableAdmin):
+    list_display = [
+        'id', 'user_response', 'respondent', 'stress_level', 'depression_score', 'anxiety_score',
+        'model_version', 'predict_date',
+    ]
+    list_filter = [
+        'predict_date',
+        score_band_filter('stress_level', 'stress'),
+        score_band_filter('depression_score', 'depression'),
+        score_band_filter('anxiety_score', 'anxiety'),
+        'model_version',
+    ]
+    list_select_related = ['user_response', 'user_response__user']
+    raw_id_fields = ['user_response']
+    ordering = ['-predict_date']
+    actions = ['export_csv']
+
+    @admin.display(description='User', ordering='user_response__user__username')
+    def respondent(self, prediction):
+        return prediction.user_response.user
+
+    @admin.action(description="Export selected predictions as CSV")
+    def export_csv(self, request, queryset):
+        fields = [
+            'id', 'user_response_id', 'stress_level', 'depression_score', 'anxiety_score',
+            'model_version', 'predict_date',
+        ]
+        rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=2000)
+        return stream_csv(f'predictions_{timezone.now():%Y%m%d-%H%M%S}.csv', fields, rows)
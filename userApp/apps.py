@@ -1,10 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UserappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'userApp'
 
-def ready(self):
+    def ready(self):
         # Or if signals are in models.py:
-        from . import models
\ No newline at end of file
+        from . import models
+        from . import signals
+        from . import warmup
+
+        # Workers load the model and indexes in the background; /readyz waits for it
+        if settings.WARMUP_ON_STARTUP and warmup.serving():
+            warmup.start()
@@ -0,0 +1,165 @@
+import os
+
+import joblib
+import numpy as np
+from sklearn.ensemble import AdaBoostRegressor, HistGradientBoostingRegressor
+from sklearn.feature_selection import SelectKBest, f_regression
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+def f_regression_multioutput(X, y):
+    """
+    f_regression averaged over targets, so SelectKBest can rank features for all three scores.
+
+    Fitted selectors pickle this function by reference, so it lives here
+    rather than in a module that needs Django settings to import.
+    """
+    y = np.asarray(y)
+    if y.ndim == 1:
+        return f_regression(X, y)
+    scores = [f_regression(X, y[:, i]) for i in range(y.shape[1])]
+    return (
+        np.mean([f for f, _ in scores], axis=0),
+        np.min([p for _, p in scores], axis=0),
+    )
+
+
+class InferenceBackend:
+    """
+    A fitted scaler, feature selector and multi-output model sharing one
+    predict() interface. Subclasses name the model file they load and the
+    estimator they train.
+    """
+
+    name = None
+    model_file = None
+    scaler_file = 'scaler.joblib'
+    feature_selector_file = 'feature_selector.joblib'
+    # n_jobs for serving: one request scores a handful of rows, far too few to pay for a worker pool
+    serving_n_jobs = None
+
+    def __init__(self, model, scaler, feature_selector):
+        self.model = model
+        self.scaler = scaler
+        self.feature_selector = feature_selector
+
+    @classmethod
+    def artifact_files(cls):
+        return {
+            'model': cls.model_file,
+            'feature_selector': cls.feature_selector_file,
+            'scaler': cls.scaler_file,
+        }
+
+    @classmethod
+    def load(cls, model_dir):
+        artifacts = {
+            name: joblib.load(os.path.join(model_dir, filename))
+            for name, filename in cls.artifact_files().items()
+        }
+        backend = cls(**artifacts)
+        # Artifacts saved before save() reset it may still carry training parallelism
+        backend.serve_in_process()
+        return backend
+
+    @classmethod
+    def estimator(cls, seed=42, n_jobs=1, n_estimators=None, learning_rate=None):
+        raise NotImplementedError
+
+    @classmethod
+    def pipeline(cls, k, score_func, **estimator_params):
+        """Unfitted scaler -> SelectKBest -> model pipeline for training"""
+        return Pipeline([
+            ('scaler', StandardScaler()),
+            ('feature_selector', SelectKBest(score_func=score_func, k=k)),
+            ('model', cls.estimator(**estimator_params)),
+        ])
+
+    def serve_in_process(self):
+        """Drop training-time parallelism so predict() never goes through joblib"""
+        self.model.set_params(n_jobs=self.serving_n_jobs)
+
+    def save(self, model_dir):
+        self.serve_in_process()
+        os.makedirs(model_dir, exist_ok=True)
+        for name, filename in self.artifact_files().items():
+            joblib.dump(getattr(self, name), os.path.join(model_dir, filename))
+
+    def transform(self, matrix):
+        """Scale and select encoded feature rows the way the model was trained"""
+        return self.feature_selector.transform(self.scaler.transform(matrix))
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+class AdaBoostBackend(InferenceBackend):
+    name = 'adaboost'
+    model_file = 'multioutput_adaboost_model.joblib'
+    # The names the shipped artifacts were saved under
+    scaler_file = 'scaler_Ada.joblib'
+    feature_selector_file = 'feature_selector_Ada.joblib'
+
+    @classmethod
+    def estimator(cls, seed=42, n_jobs=1, n_estimators=None, learning_rate=None):
+        return MultiOutputRegressor(
+            AdaBoostRegressor(
+                n_estimators=n_estimators or 50,
+                learning_rate=learning_rate or 0.01,
+                random_state=seed,
+            ),
+            n_jobs=n_jobs,
+        )
+
+
+class HistGradientBoostingBackend(InferenceBackend):
+    name = 'hist_gradient_boosting'
+    model_file = 'multioutput_hgb_model.joblib'
+
+    @classmethod
+    def estimator(cls, seed=42, n_jobs=1, n_estimators=None, learning_rate=None):
+        return MultiOutputRegressor(
+            HistGradientBoostingRegressor(
+                max_iter=n_estimators or 100,
+                learning_rate=learning_rate or 0.05,
+                max_depth=4,
+                early_stopping=False,
+                random_state=seed,
+            ),
+            n_jobs=n_jobs,
+        )
+
+
+class XGBoostBackend(InferenceBackend):
+    name = 'xgboost'
+    model_file = 'xgboost_hist_model.joblib'
+    serving_n_jobs = 1
+
+    @classmethod
+    def estimator(cls, seed=42, n_jobs=1, n_estimators=None, learning_rate=None):
+        # Imported here so the other backends work without xgboost installed
+        from xgboost import XGBRegressor
+
+        # One tree per output per round, fitted on the 2-D target natively
+        return XGBRegressor(
+            tree_method='hist',
+            n_estimators=n_estimators or 200,
+            learning_rate=learning_rate or 0.05,
+            max_depth=4,
+            random_state=seed,
+            n_jobs=n_jobs,
+        )
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (AdaBoostBackend, HistGradientBoostingBackend, XGBoostBackend)
+}
+
+
+def get_backend(name):
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown inference backend {name!r}, expected one of {sorted(BACKENDS)}")
@@ -0,0 +1,114 @@
+from functools import cache
+
+from django.db import models
+
+# Each enum's integer values are the encoding the ML models were trained on,
+# and its labels are the strings the form and the JSON API accept.
+
+
+class Gender(models.IntegerChoices):
+    MALE = 0, 'Male'
+    FEMALE = 1, 'Female'
+    OTHERS = 2, 'Others'
+
+
+class Course(models.IntegerChoices):
+    ENGINEERING = 0, 'Engineering'
+    BUSINESS = 1, 'Business'
+    COMPUTER = 2, 'Computer'
+    LAW = 3, 'Law'
+    MEDICAL = 4, 'Medical'
+    OTHER = 5, 'Other'
+
+
+class Quality(models.IntegerChoices):
+    GOOD = 0, 'Good'
+    AVERAGE = 1, 'Average'
+    POOR = 2, 'Poor'
+
+
+class Level(models.IntegerChoices):
+    LOW = 0, 'Low'
+    MODERATE = 1, 'Moderate'
+    HIGH = 2, 'High'
+
+
+class RelationshipStatus(models.IntegerChoices):
+    SINGLE = 0, 'Single'
+    IN_A_RELATIONSHIP = 1, 'In a relationship'
+    MARRIED = 2, 'Married'
+
+
+class Frequency(models.IntegerChoices):
+    NEVER = 0, 'Never'
+    OCCASIONALLY = 1, 'Occasionally'
+    FREQUENTLY = 2, 'Frequently'
+
+
+class YesNo(models.IntegerChoices):
+    YES = 1, 'Yes'
+    NO = 0, 'No'
+
+
+class ResidenceType(models.IntegerChoices):
+    ON_CAMPUS = 0, 'On-Campus'
+    OFF_CAMPUS = 1, 'Off-Campus'
+    WITH_FAMILY = 2, 'With Family'
+
+
+# Model feature name -> form/model field name, in the order the model expects
+FEATURE_FIELDS = {
+    'Age': 'age',
+    'Course': 'course',
+    'Gender': 'gender',
+    'CGPA': 'cgpa',
+    'Sleep_Quality': 'sleep_quality',
+    'Social_Support': 'social_support',
+    'Relationship_Status': 'relationship_status',
+    'Substance_Use': 'substance_use',
+    'Counseling_Service_Use': 'counseling_service_use',
+    'Semester_Credit_Load': 'semester_credit_load',
+    'Family_History': 'family_history',
+    'Chronic_Illness': 'chronic_illness',
+    'Extracurricular_Involvement': 'extracurricular_involvement',
+    'Residence_Type': 'residence_type',
+    'Physical_Activity': 'physical_activity',
+    'Diet_Quality': 'diet_quality',
+    'Financial_Stress': 'financial_stress',
+}
+
+# Categorical form/model field name -> choices enum
+CATEGORICAL_FIELDS = {
+    'gender': Gender,
+    'course': Course,
+    'sleep_quality': Quality,
+    'physical_activity': Level,
+    'diet_quality': Quality,
+    'social_support': Level,
+    'relationship_status': RelationshipStatus,
+    'substance_use': Frequency,
+    'counseling_service_use': Frequency,
+    'family_history': YesNo,
+    'chronic_illness': YesNo,
+    'extracurricular_involvement': Level,
+    'residence_type': ResidenceType,
+}
+
+
+@cache
+def encoding(choices):
+    """Label -> integer code mapping for a choices enum"""
+    return {label: value for value, label in choices.choices}
+
+
+def encode(choices, label):
+    """Integer code for a label, or None when the label is unknown"""
+    return encoding(choices).get(label)
+
+
+def form_choices(choices, placeholder, display=None):
+    """Form select choices posting the enum labels, with a leading placeholder"""
+    display = display or {}
+    return [('', placeholder)] + [
+        (label, display.get(value, label)) for value, label in choices.choices
+    ]
@@ -0,0 +1,169 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS, encoding
+from .ml import expected_features, manual_encode
+
+logger = logging.getLogger(__name__)
+
+DATASET_PATH = os.path.join(settings.BASE_DIR, 'Dataset.csv')
+
+TARGETS = ['Stress_Level', 'Depression_Score', 'Anxiety_Score']
+
+# Dataset.csv spells a few categories differently from the form
+DATASET_ALIASES = {
+    'Course': {'Computer Science': 'Computer', 'Others': 'Other'},
+    'Relationship_Status': {'In a Relationship': 'In a relationship'},
+}
+
+# Bump when a parser's output changes without the source or encodings changing
+COLUMNAR_FORMAT_VERSION = 1
+
+# Columns already read by this process, keyed by cache file path
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encoding_fingerprint():
+    """The label -> code tables parsers encode with, so changing them invalidates caches"""
+    tables = {field: encoding(choices) for field, choices in CATEGORICAL_FIELDS.items()}
+    return json.dumps([COLUMNAR_FORMAT_VERSION, tables, DATASET_ALIASES], sort_keys=True)
+
+
+def load_columnar(path, parse, cache_dir=None):
+    """
+    Columns parsed from `path` by parse(path), a dict of name -> 1-d array.
+
+    The first load writes them to an uncompressed .npz in `cache_dir`
+    (DATASET_CACHE_DIR by default) named after the source file's content
+    hash, the parser and the encoding tables; later loads read that file
+    instead of parsing, and a changed source gets a new entry while old
+    ones are removed. Arrays are also kept in memory per process.
+    """
+    cache_dir = cache_dir or settings.DATASET_CACHE_DIR
+    digest = hashlib.sha256(f'{file_hash(path)}:{parse.__name__}:{encoding_fingerprint()}'.encode())
+    prefix = f'{os.path.splitext(os.path.basename(path))[0]}-{parse.__name__}-'
+    cache_path = os.path.join(cache_dir, f'{prefix}{digest.hexdigest()[:16]}.npz')
+
+    with _loaded_lock:
+        columns = _loaded.get(cache_path)
+    if columns is not None:
+        return columns
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            columns = {name: npz[name] for name in npz.files}
+    except FileNotFoundError:
+        columns = {name: np.asarray(values) for name, values in parse(path).items()}
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for stale in glob.glob(os.path.join(cache_dir, f'{glob.escape(prefix)}*.npz')):
+                os.remove(stale)
+            # Written under a temporary name so concurrent readers never see half a file
+            partial = f'{cache_path}.{os.getpid()}.tmp'
+            with open(partial, 'wb') as f:
+                np.savez(f, **columns)
+            os.replace(partial, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write columnar cache {cache_path}: {str(e)}")
+
+    with _loaded_lock:
+        _loaded[cache_path] = columns
+    return columns
+
+
+def parse_reference_dataset(path):
+    """Dataset.csv as integer category codes and float columns, complete rows only"""
+    df = pd.read_csv(path)
+    for column, aliases in DATASET_ALIASES.items():
+        df[column] = df[column].replace(aliases)
+
+    features = manual_encode(df[expected_features].copy()).astype(float)
+    targets = df[TARGETS].astype(float)
+    complete = (features.notna().all(axis=1) & targets.notna().all(axis=1)).to_numpy()
+    return {**_feature_columns(features[complete]), **{t: targets[t].to_numpy()[complete] for t in TARGETS}}
+
+
+def parse_response_export(path):
+    """A UserResponse CSV export (e.g. from the admin) as codes, complete rows only"""
+    df = pd.read_csv(path)
+    features = pd.DataFrame({feature: df[field] for feature, field in FEATURE_FIELDS.items()})
+    features = manual_encode(features).astype(float)
+    complete = features.notna().all(axis=1).to_numpy()
+    return {'id': df['id'].to_numpy()[complete], **_feature_columns(features[complete])}
+
+
+def _feature_columns(features):
+    return {
+        feature: features[feature].to_numpy(dtype=np.int8 if field in CATEGORICAL_FIELDS else float)
+        for feature, field in FEATURE_FIELDS.items()
+    }
+
+
+def _feature_frame(columns):
+    return pd.DataFrame({feature: columns[feature] for feature in expected_features}, dtype=float)
+
+
+def load_reference_dataset(path=DATASET_PATH, cache_dir=None):
+    """
+    Encoded features and targets from Dataset.csv.
+
+    Rows with a missing or unknown answer are dropped, since the model
+    cannot score them.
+    """
+    columns = load_columnar(path, parse_reference_dataset, cache_dir)
+    targets = pd.DataFrame({target: columns[target] for target in TARGETS})
+    return _feature_frame(columns), targets
+
+
+def load_response_export(path, cache_dir=None):
+    """Encoded features of an exported UserResponse CSV, indexed by response id"""
+    columns = load_columnar(path, parse_response_export, cache_dir)
+    features = _feature_frame(columns)
+    features.index = pd.Index(columns['id'], name='id')
+    return features
+
+
+def load_stored_responses():
+    """
+    Encoded features of stored responses, with their latest prediction as target.
+
+    The targets are model outputs rather than ground truth, so they are only
+    useful to keep a retrained model consistent with past predictions.
+    """
+    from .models import Prediction
+
+    latest = {}
+    rows = (
+        Prediction.objects
+        .order_by('user_response_id', 'predict_date')
+        .select_related('user_response')
+    )
+    for prediction in rows.iterator(chunk_size=2000):
+        latest[prediction.user_response_id] = prediction
+
+    features = np.array([p.user_response.feature_row() for p in latest.values()], dtype=float)
+    targets = np.array([
+        [float(p.stress_level), float(p.depression_score), float(p.anxiety_score)]
+        for p in latest.values()
+    ], dtype=float)
+    features = pd.DataFrame(features.reshape(-1, len(expected_features)), columns=expected_features)
+    targets = pd.DataFrame(targets.reshape(-1, len(TARGETS)), columns=TARGETS)
+    complete = features.notna().all(axis=1)
+    return features[complete].reset_index(drop=True), targets[complete].reset_index(drop=True)
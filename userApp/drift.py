@@ -0,0 +1,104 @@
+import bisect
+import logging
+import math
+import threading
+
+import numpy as np
+
+from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Proportions are floored at this before taking logs, so empty bins don't give infinite PSI
+PSI_EPSILON = 1e-4
+
+
+class DriftMonitor:
+    """
+    Constant-memory comparison of live encoded feature rows against a
+    reference sample.
+
+    Each feature keeps counts over fixed bins (one per category code, or
+    reference deciles for numeric features) and a running mean/variance.
+    snapshot() reports PSI and a binned Kolmogorov-Smirnov statistic against
+    the reference distribution. State is per process, so each gunicorn
+    worker reports on the requests it has served.
+    """
+
+    def __init__(self, features, reference, numeric_bins=10):
+        self.features = list(features)
+        reference = np.asarray(reference, dtype=float)
+        self.edges = []
+        self.expected = []
+        for i, feature in enumerate(self.features):
+            values = reference[:, i][~np.isnan(reference[:, i])]
+            if FEATURE_FIELDS.get(feature) in CATEGORICAL_FIELDS:
+                codes = sorted(CATEGORICAL_FIELDS[FEATURE_FIELDS[feature]].values)
+                edges = [code + 0.5 for code in codes[:-1]]
+            else:
+                quantiles = np.linspace(0, 1, numeric_bins + 1)[1:-1]
+                edges = np.unique(np.quantile(values, quantiles)).tolist()
+            counts = np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+            self.edges.append(edges)
+            self.expected.append(counts / counts.sum())
+        self.baseline_mean = np.nanmean(reference, axis=0)
+        self.baseline_std = np.nanstd(reference, axis=0)
+
+        self._lock = threading.Lock()
+        self._counts = [[0] * (len(edges) + 1) for edges in self.edges]
+        self._n = 0
+        self._mean = np.zeros(len(self.features))
+        self._m2 = np.zeros(len(self.features))
+
+    @classmethod
+    def from_reference_dataset(cls):
+        from .datasets import load_reference_dataset
+
+        features, _ = load_reference_dataset()
+        return cls(features.columns, features.to_numpy())
+
+    def observe_many(self, matrix):
+        """Add encoded, unscaled feature rows in the model's feature order"""
+        for row in np.asarray(matrix, dtype=float):
+            self.observe(row)
+
+    def observe(self, row):
+        indices = [bisect.bisect_right(edges, value) for edges, value in zip(self.edges, row.tolist())]
+        with self._lock:
+            for counts, index in zip(self._counts, indices):
+                counts[index] += 1
+            # Welford's online update
+            self._n += 1
+            delta = row - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (row - self._mean)
+
+    def snapshot(self):
+        with self._lock:
+            n = self._n
+            counts = [list(c) for c in self._counts]
+            mean, m2 = self._mean.copy(), self._m2.copy()
+
+        features = {}
+        for i, feature in enumerate(self.features):
+            expected = self.expected[i]
+            report = {
+                'baseline_mean': float(self.baseline_mean[i]),
+                'baseline_std': float(self.baseline_std[i]),
+            }
+            if n:
+                actual = np.asarray(counts[i]) / n
+                a, e = np.maximum(actual, PSI_EPSILON), np.maximum(expected, PSI_EPSILON)
+                std = math.sqrt(m2[i] / n)
+                report.update({
+                    'psi': float(np.sum((a - e) * np.log(a / e))),
+                    'ks': float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected)))),
+                    'mean': float(mean[i]),
+                    'std': std,
+                    'mean_shift': (
+                        float((mean[i] - self.baseline_mean[i]) / self.baseline_std[i])
+                        if self.baseline_std[i] else 0.0
+                    ),
+                })
+            features[feature] = report
+        return {'observed': n, 'features': features}
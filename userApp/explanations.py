@@ -0,0 +1,108 @@
+import logging
+
+import numpy as np
+
+from .choices import FEATURE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+TARGET_KEYS = ['stress', 'depression', 'anxiety']
+
+
+class CompiledTree:
+    """
+    A fitted decision tree flattened into Python lists for fast single-row
+    traversal, with each leaf's path attribution precomputed.
+
+    Following a row from the root, every split moves the node mean from the
+    parent's value to the child's; that change is credited to the split
+    feature. Summed along the path the credits plus the root mean equal the
+    leaf value, so each leaf has one fixed contribution vector.
+    """
+
+    def __init__(self, tree, n_features):
+        tree_ = tree.tree_
+        self.left = tree_.children_left.tolist()
+        self.right = tree_.children_right.tolist()
+        self.feature = tree_.feature.tolist()
+        self.threshold = tree_.threshold.tolist()
+        values = tree_.value[:, 0, 0]
+        self.root_value = float(values[0])
+
+        self.leaves = {}
+        contributions = []
+        stack = [(0, np.zeros(n_features))]
+        while stack:
+            node, path = stack.pop()
+            if self.left[node] == -1:
+                self.leaves[node] = len(contributions)
+                contributions.append(path)
+                continue
+            for child in (self.left[node], self.right[node]):
+                child_path = path.copy()
+                child_path[self.feature[node]] += values[child] - values[node]
+                stack.append((child, child_path))
+        self.contributions = np.array(contributions)
+
+    def leaf(self, row):
+        """Index into `contributions` of the leaf `row` lands in"""
+        left, right, feature, threshold = self.left, self.right, self.feature, self.threshold
+        node = 0
+        while left[node] != -1:
+            node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+        return self.leaves[node]
+
+
+class TreePathExplainer:
+    """
+    Per-feature contributions for a MultiOutput AdaBoost model of decision
+    trees, mapped back through the feature selector to form field names.
+
+    AdaBoostRegressor predicts the weighted median of its trees, which has no
+    additive decomposition, so contributions explain the weight-averaged tree
+    output instead: `baseline` plus the contributions equals that average.
+    It tracks the median closely and ranks the answers that moved the score.
+    """
+
+    def __init__(self, model, feature_selector):
+        support = feature_selector.get_support(indices=True)
+        self.fields = [FEATURE_FIELDS[feature] for feature in np.asarray(list(FEATURE_FIELDS))[support]]
+        self.outputs = [self._compile(regressor) for regressor in model.estimators_]
+
+    def _compile(self, regressor):
+        trees = [CompiledTree(tree, len(self.fields)) for tree in regressor.estimators_]
+        weights = np.asarray(regressor.estimator_weights_[:len(trees)], dtype=float)
+        weights = weights / weights.sum()
+
+        # One table of weighted leaf contributions per output, summed with a single gather
+        offsets = np.cumsum([0] + [len(tree.contributions) for tree in trees])
+        table = np.vstack([w * tree.contributions for w, tree in zip(weights, trees)])
+        baseline = float(sum(w * tree.root_value for w, tree in zip(weights, trees)))
+        return trees, offsets[:-1].tolist(), table, baseline
+
+    def explain(self, X):
+        """
+        Contributions for the first row of selected, scaled features `X`,
+        keyed by target then form field and ordered by magnitude.
+        """
+        # Trees compare float32 features against their thresholds
+        row = np.asarray(X, dtype=np.float32).reshape(-1)[:len(self.fields)].tolist()
+        explanation = {}
+        for key, (trees, offsets, table, baseline) in zip(TARGET_KEYS, self.outputs):
+            rows = [offset + tree.leaf(row) for tree, offset in zip(trees, offsets)]
+            contributions = table[rows].sum(axis=0)
+            order = np.argsort(-np.abs(contributions), kind='stable')
+            explanation[key] = {
+                'baseline': baseline,
+                'contributions': {self.fields[i]: float(contributions[i]) for i in order},
+            }
+        return explanation
+
+
+def build_explainer(backend):
+    """TreePathExplainer for the loaded backend, or None when its model isn't AdaBoost trees"""
+    try:
+        return TreePathExplainer(backend.model, backend.feature_selector)
+    except (AttributeError, TypeError) as e:
+        logger.info(f"Tree path explanations unavailable for {backend.name}: {str(e)}")
+        return None
@@ -3,6 +3,10 @@ from django.contrib.auth.forms import PasswordChangeForm, UserCreationForm
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from .models import Profile
+from .choices import (
+    Course, Frequency, Gender, Level, Quality, RelationshipStatus, ResidenceType,
+    YesNo, form_choices,
+)
 from django.core.validators import EmailValidator, RegexValidator
 
 
@@ -13,27 +17,16 @@ class MentalHealthForm(forms.Form):
         validators=[MinValueValidator(10), MaxValueValidator(100)]
     )
     
-    GENDER_CHOICES = [
-        ('', '-- Select Gender --'),
-        ('Male', 'Male'),
-        ('Female', 'Female'),
-        ('Others', 'Others'),
-    ]
+    GENDER_CHOICES = form_choices(Gender, '-- Select Gender --')
     gender = forms.ChoiceField(
         label='Gender',
         choices=GENDER_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
-    COURSE_CHOICES = [
-        ('', '-- Select Course --'),
-        ('Engineering', 'Engineering'),
-        ('Business', 'Business'),
-        ('Computer', 'Computer Science'),
-        ('Law', 'Law'),
-        ('Medical', 'Medical'),
-        ('Other', 'Other'),
-    ]
+    COURSE_CHOICES = form_choices(
+        Course, '-- Select Course --', {Course.COMPUTER: 'Computer Science'}
+    )
     course = forms.ChoiceField(
         label='Course',
         choices=COURSE_CHOICES,
@@ -56,60 +49,35 @@ class MentalHealthForm(forms.Form):
         validators=[MinValueValidator(1), MaxValueValidator(30)]
     )
     
-    SLEEP_QUALITY_CHOICES = [
-        ('', '-- Select Sleep Quality --'),
-        ('Good', 'Good'),
-        ('Average', 'Average'),
-        ('Poor', 'Poor'),
-    ]
+    SLEEP_QUALITY_CHOICES = form_choices(Quality, '-- Select Sleep Quality --')
     sleep_quality = forms.ChoiceField(
         label='Sleep Quality',
         choices=SLEEP_QUALITY_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
-    PHYSICAL_ACTIVITY_CHOICES = [
-        ('', '-- Select Physical Activity --'),
-        ('Low', 'Low'),
-        ('Moderate', 'Moderate'),
-        ('High', 'High'),
-    ]
+    PHYSICAL_ACTIVITY_CHOICES = form_choices(Level, '-- Select Physical Activity --')
     physical_activity = forms.ChoiceField(
         label='Physical Activity',
         choices=PHYSICAL_ACTIVITY_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
-    DIET_QUALITY_CHOICES = [
-        ('', '-- Select Diet Quality --'),
-        ('Good', 'Good'),
-        ('Average', 'Average'),
-        ('Poor', 'Poor'),
-    ]
+    DIET_QUALITY_CHOICES = form_choices(Quality, '-- Select Diet Quality --')
     diet_quality = forms.ChoiceField(
         label='Diet Quality',
         choices=DIET_QUALITY_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
-    SOCIAL_SUPPORT_CHOICES = [
-        ('', '-- Select Social Support --'),
-        ('Low', 'Low'),
-        ('Moderate', 'Moderate'),
-        ('High', 'High'),
-    ]
+    SOCIAL_SUPPORT_CHOICES = form_choices(Level, '-- Select Social Support --')
     social_support = forms.ChoiceField(
         label='Social Support',
         choices=SOCIAL_SUPPORT_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
-    RELATIONSHIP_STATUS_CHOICES = [
-        ('', '-- Select Relationship Status --'),
-        ('Single', 'Single'),
-        ('In a relationship', 'In a relationship'),
-        ('Married', 'Married'),
-    ]
+    RELATIONSHIP_STATUS_CHOICES = form_choices(RelationshipStatus, '-- Select Relationship Status --')
     relationship_status = forms.ChoiceField(
         label='Relationship Status',
         choices=RELATIONSHIP_STATUS_CHOICES,
@@ -127,70 +95,42 @@ class MentalHealthForm(forms.Form):
         validators=[MinValueValidator(1), MaxValueValidator(5)]
     )
 
-    SUBSTANCE_USE_CHOICES = [
-        ('', '-- Select Substance Use --'),
-        ('Never', 'Never'),
-        ('Occasionally', 'Occasionally'),
-        ('Frequently', 'Frequently'),
-    ]
+    SUBSTANCE_USE_CHOICES = form_choices(Frequency, '-- Select Substance Use --')
     substance_use = forms.ChoiceField(
         label='Substance Use',
         choices=SUBSTANCE_USE_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
 
-    COUNSELING_CHOICES = [
-        ('', '-- Select Counseling Usage --'),
-        ('Never', 'Never'),
-        ('Occasionally', 'Occasionally'),
-        ('Frequently', 'Frequently'),
-    ]
+    COUNSELING_CHOICES = form_choices(Frequency, '-- Select Counseling Usage --')
     counseling_service_use = forms.ChoiceField(
         label='Counseling Service Usage',
         choices=COUNSELING_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
 
-    FAMILY_HISTORY_CHOICES = [
-        ('', '-- Select Family History --'),
-        ('Yes', 'Yes'),
-        ('No', 'No'),
-    ]
+    FAMILY_HISTORY_CHOICES = form_choices(YesNo, '-- Select Family History --')
     family_history = forms.ChoiceField(
         label='Family History of Mental Health Issues',
         choices=FAMILY_HISTORY_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
 
-    CHRONIC_ILLNESS_CHOICES = [
-        ('', '-- Select Chronic Illness --'),
-        ('Yes', 'Yes'),
-        ('No', 'No'),
-    ]
+    CHRONIC_ILLNESS_CHOICES = form_choices(YesNo, '-- Select Chronic Illness --')
     chronic_illness = forms.ChoiceField(
         label='Chronic Illness',
         choices=CHRONIC_ILLNESS_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
 
-    EXTRACURRICULAR_CHOICES = [
-        ('', '-- Select Involvement Level --'),
-        ('Low', 'Low'),
-        ('Moderate', 'Moderate'),
-        ('High', 'High'),
-    ]
+    EXTRACURRICULAR_CHOICES = form_choices(Level, '-- Select Involvement Level --')
     extracurricular_involvement = forms.ChoiceField(
         label='Extracurricular Involvement',
         choices=EXTRACURRICULAR_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'}),
     )
 
-    RESIDENCE_CHOICES = [
-        ('', '-- Select Residence Type --'),
-        ('On-Campus', 'On-Campus'),
-        ('Off-Campus', 'Off-Campus'),
-        ('With Family', 'With Family'),
-    ]
+    RESIDENCE_CHOICES = form_choices(ResidenceType, '-- Select Residence Type --')
     residence_type = forms.ChoiceField(
         label='Residence Type',
         choices=RESIDENCE_CHOICES,
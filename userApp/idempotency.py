@@ -0,0 +1,85 @@
+import hashlib
+import json
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .ratelimit import client_key
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+SUBMISSION_TOKEN_FIELD = 'submission_token'
+KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+PENDING = '__pending__'
+# A claim outlives a crashed request by this long at most
+PENDING_TIMEOUT = 30
+# How long a duplicate waits for the original request to finish
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+
+
+def new_submission_token():
+    return uuid.uuid4().hex
+
+
+def form_fingerprint(post):
+    """The submitted answers, without per-render tokens"""
+    answers = sorted(
+        (name, post.getlist(name)) for name in post
+        if name not in ('csrfmiddlewaretoken', SUBMISSION_TOKEN_FIELD)
+    )
+    return json.dumps(answers).encode()
+
+
+class Submission:
+    """
+    An idempotent request: either a claim this request must complete() or
+    release(), or the result a previous identical request stored, or a
+    duplicate of one still in progress. Requests without a key get an
+    unkeyed Submission whose methods do nothing.
+    """
+
+    def __init__(self, cache_key=None, digest=None, result=None, in_progress=False):
+        self.cache_key = cache_key
+        self.digest = digest
+        self.result = result
+        self.in_progress = in_progress
+
+    @property
+    def owned(self):
+        return self.cache_key is not None and self.result is None and not self.in_progress
+
+    def complete(self, result):
+        if self.owned:
+            cache.set(self.cache_key, result, settings.IDEMPOTENCY_TTL)
+
+    def release(self):
+        if self.owned:
+            cache.delete(self.cache_key)
+
+
+def claim(request, scope, key, fingerprint):
+    """
+    Claim `key` for this client and request body (`fingerprint`, bytes).
+
+    The same key with a different body counts as a different request, so an
+    edited form resubmitted with its old token is scored afresh.
+    """
+    if not settings.IDEMPOTENCY_ENABLED or not key or not KEY_PATTERN.match(key):
+        return Submission()
+    digest = hashlib.sha256(key.encode() + b':' + fingerprint).hexdigest()[:32]
+    cache_key = f'idempotency:{scope}:{client_key(request)}:{digest}'
+
+    deadline = time.monotonic() + WAIT_SECONDS
+    while True:
+        if cache.add(cache_key, PENDING, PENDING_TIMEOUT):
+            return Submission(cache_key, digest)
+        stored = cache.get(cache_key)
+        if stored is not None and stored != PENDING:
+            return Submission(cache_key, digest, result=stored)
+        if time.monotonic() >= deadline:
+            return Submission(cache_key, digest, in_progress=True)
+        time.sleep(POLL_SECONDS)
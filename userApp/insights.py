@@ -0,0 +1,219 @@
+import json
+import math
+
+from django.conf import settings
+
+TARGET_KEYS = ['stress', 'depression', 'anxiety']
+
+# A score below the first threshold is Low, below the second Moderate, otherwise High
+LEVEL_THRESHOLDS = {'stress': (2, 3.5), 'depression': (2, 3.5), 'anxiety': (2, 3.5)}
+
+# Explanation bands: High at >= the second threshold, Moderate at >= the first
+EXPLANATION_THRESHOLDS = {'stress': (2, 4), 'depression': (2, 4), 'anxiety': (2, 4)}
+
+RECOMMENDATIONS = {
+    'stress': {
+        'High': [
+            "Practice mindfulness and relaxation techniques",
+            "Consider seeking professional help",
+            "Prioritize sleep and healthy eating",
+            "Take regular breaks during work/study (5 min every hour)",
+        ],
+        'Moderate': [
+            "Maintain a healthy lifestyle with balanced diet and regular exercise",
+            "Practice daily mindfulness or meditation (10-15 minutes)",
+            "Establish a consistent sleep schedule (7-9 hours)",
+            "Connect with friends and family",
+        ],
+        'Low': [
+            "Continue with stress-reducing activities",
+            "Practice gratitude journaling (3 things daily)",
+            "Engage in regular physical activity",
+            "Maintain work-life balance",
+        ],
+    },
+    'depression': {
+        'High': [
+            "Seek professional help immediately",
+            "Prioritize sleep and healthy eating",
+            "Engage in activities you enjoy",
+            "Connect with support groups or trusted friends",
+        ],
+        'Moderate': [
+            "Consider talking to a therapist or counselor",
+            "Establish a daily routine with achievable goals",
+            "Practice self-care activities",
+            "Try progressive muscle relaxation techniques",
+        ],
+        'Low': [
+            "Maintain a positive outlook",
+            "Continue with activities that promote mental well-being",
+            "Practice gratitude journaling (3 things daily)",
+            "Engage in social activities",
+        ],
+    },
+    'anxiety': {
+        'High': [
+            "Consult with a mental health professional",
+            "Practice deep breathing exercises (4-7-8 technique)",
+            "Limit caffeine and alcohol intake",
+            "Establish a worry time (15-20 minutes scheduled)",
+        ],
+        'Moderate': [
+            "Engage in relaxation techniques",
+            "Challenge negative thoughts",
+            "Consider joining a support group",
+            "Try progressive muscle relaxation techniques",
+        ],
+        'Low': [
+            "Maintain a healthy lifestyle",
+            "Continue with anxiety-reducing practices",
+            "Practice mindfulness exercises",
+            "Establish a consistent daily routine",
+        ],
+    },
+}
+
+EXPLANATIONS = {
+    'stress': {
+        'High': [
+            "High stress level detected - consider stress management techniques such as mindfulness, exercise, or counseling.",
+            "Chronic high stress can impact physical health - monitor blood pressure and sleep patterns regularly.",
+            "Consider identifying specific stress triggers through journaling to better manage them.",
+        ],
+        'Moderate': [
+            "Moderate stress level - monitor your stress regularly and try healthy coping mechanisms.",
+            "Even moderate stress can accumulate - schedule regular relaxation breaks throughout your day.",
+            "Physical activity like walking or yoga can help moderate stress levels effectively.",
+        ],
+        'Low': [
+            "Your stress level appears within the normal range.",
+            "Maintaining healthy habits will help keep your stress levels in check.",
+            "Regular self-check-ins can help detect early signs of increasing stress.",
+        ],
+    },
+    'depression': {
+        'High': [
+            "High depression score - seeking support from a mental health professional is recommended.",
+            "Persistent depression may affect daily functioning - consider reaching out to support networks.",
+            "Small, manageable goals can help create positive momentum when dealing with depression.",
+        ],
+        'Moderate': [
+            "Moderate depression score - be aware of changes in mood and talk to someone you trust.",
+            "Maintaining social connections can help prevent moderate depression from worsening.",
+            "Morning sunlight exposure and regular sleep patterns may help improve mood.",
+        ],
+        'Low': [
+            "Your depression score appears within the normal range.",
+            "Continuing to engage in meaningful activities supports mental wellbeing.",
+            "Regular mood check-ins can help maintain emotional balance.",
+        ],
+    },
+    'anxiety': {
+        'High': [
+            "High anxiety score - relaxation techniques or speaking to a counselor may help.",
+            "For acute anxiety, grounding techniques like 5-4-3-2-1 can provide immediate relief.",
+            "Consider limiting caffeine and creating predictable routines to reduce anxiety triggers.",
+        ],
+        'Moderate': [
+            "Moderate anxiety score - try to manage your triggers and seek support if needed.",
+            "Breathing exercises practiced daily can help regulate moderate anxiety responses.",
+            "Scheduling 'worry time' can contain anxious thoughts to specific periods.",
+        ],
+        'Low': [
+            "Your anxiety score appears within the normal range.",
+            "Maintaining regular relaxation practices can help prevent anxiety buildup.",
+            "Being aware of physical tension can help catch early signs of anxiety.",
+        ],
+    },
+}
+
+BANDS = ['Low', 'Moderate', 'High']
+
+
+def insight_level(key, score):
+    low, high = LEVEL_THRESHOLDS[key]
+    return "Low" if score < low else "Moderate" if score < high else "High"
+
+
+def explanation_band(key, score):
+    low, high = EXPLANATION_THRESHOLDS[key]
+    return "High" if score >= high else "Moderate" if score >= low else "Low"
+
+
+def build_insights(scores):
+    """Insights dict for one row of (stress, depression, anxiety) scores"""
+    insights = {}
+    for key, score in zip(TARGET_KEYS, scores):
+        level = insight_level(key, score)
+        insights[key] = {
+            'score': float(score),
+            'level': level,
+            'recommendations': list(RECOMMENDATIONS[key][level]),
+        }
+    return insights
+
+
+def build_explanations(scores):
+    """Explanation sentences for one row of scores, in stress, depression, anxiety order"""
+    return [
+        sentence
+        for key, score in zip(TARGET_KEYS, scores)
+        for sentence in EXPLANATIONS[key][explanation_band(key, score)]
+    ]
+
+
+# Pre-encoded JSON for everything in a prediction response except the scores,
+# matching what JsonResponse's json.dumps would produce for the same dict
+def _encode(value):
+    return json.dumps(value)
+
+
+INSIGHT_FRAGMENTS = {
+    key: {
+        level: f', "level": {_encode(level)}, "recommendations": {_encode(RECOMMENDATIONS[key][level])}}}'
+        for level in BANDS
+    }
+    for key in TARGET_KEYS
+}
+
+EXPLANATION_FRAGMENTS = {
+    (stress, depression, anxiety): _encode({'explanations': (
+        EXPLANATIONS['stress'][stress] + EXPLANATIONS['depression'][depression] + EXPLANATIONS['anxiety'][anxiety]
+    )})
+    for stress in BANDS for depression in BANDS for anxiety in BANDS
+}
+
+
+def _encode_float(value):
+    # json.dumps writes finite floats with float.__repr__
+    return float.__repr__(value) if math.isfinite(value) else _encode(value)
+
+
+def _encode_extra(value):
+    if settings.FAST_JSON:
+        import orjson
+
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return _encode(value)
+
+
+def encode_prediction_response(prediction, **extra):
+    """
+    The success payload of predict_api as bytes, byte-identical to
+    JsonResponse({'status': 'success', 'prediction': ..., 'insights': ...,
+    'explanation': ..., **extra}) but splicing the scores into prebuilt text.
+    """
+    scores = [float(score) for score in prediction[0]]
+    encoded = [_encode_float(score) for score in scores]
+    parts = ['{"status": "success", "prediction": [[', ', '.join(encoded), ']], "insights": {']
+    for i, (key, score) in enumerate(zip(TARGET_KEYS, scores)):
+        if i:
+            parts.append(', ')
+        parts.extend((f'"{key}": {{"score": ', encoded[i], INSIGHT_FRAGMENTS[key][insight_level(key, score)]))
+    bands = tuple(explanation_band(key, score) for key, score in zip(TARGET_KEYS, scores))
+    parts.extend(('}, "explanation": ', EXPLANATION_FRAGMENTS[bands]))
+    for name, value in extra.items():
+        parts.extend((', ', _encode(name), ': ', _encode_extra(value)))
+    parts.append('}')
+    return ''.join(parts).encode()
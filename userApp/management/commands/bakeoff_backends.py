@@ -0,0 +1,115 @@
+import gc
+import json
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from sklearn.model_selection import train_test_split
+
+from userApp.backends import BACKENDS, f_regression_multioutput
+from userApp.datasets import DATASET_PATH, TARGETS, load_reference_dataset
+from userApp.ml import expected_features
+
+
+class Command(BaseCommand):
+    help = (
+        "Train every inference backend on Dataset.csv and compare holdout MAE, "
+        "single-row latency, batch throughput and memory: the traced peak while "
+        "loading the model and scoring one row, next to the pickle size as a "
+        "proxy. Memory a native library allocates itself (XGBoost's booster "
+        "once loaded) is not traced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=DATASET_PATH)
+        parser.add_argument('--backends', nargs='+', default=sorted(BACKENDS), choices=sorted(BACKENDS))
+        parser.add_argument('--test-size', type=float, default=0.2)
+        parser.add_argument('--latency-samples', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', dest='json_path', default=None, help="Also write the results here.")
+
+    def handle(self, *args, **options):
+        features, targets = load_reference_dataset(options['dataset'])
+        X_train, X_test, y_train, y_test = train_test_split(
+            features.to_numpy(), targets.to_numpy(),
+            test_size=options['test_size'], random_state=options['seed'],
+        )
+        self.stdout.write(f"Training on {len(X_train)} rows, evaluating on {len(X_test)}")
+
+        results = []
+        for name in options['backends']:
+            try:
+                results.append(self.evaluate(BACKENDS[name], X_train, X_test, y_train, y_test, options))
+            except ImportError as e:
+                self.stdout.write(self.style.WARNING(f"Skipping {name}: {str(e)}"))
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'backend':<24}{'MAE':>8}{'p50 ms':>9}{'p99 ms':>9}{'batch rows/s':>14}{'memory KB':>11}{'pickle KB':>11}"
+            f"{'fit s':>8}"
+        )
+        for result in sorted(results, key=lambda r: r['mae']):
+            self.stdout.write(
+                f"{result['backend']:<24}{result['mae']:>8.4f}{result['p50_ms']:>9.3f}"
+                f"{result['p99_ms']:>9.3f}{result['batch_rows_per_second']:>14.0f}"
+                f"{result['memory_peak_bytes'] / 1024:>11.1f}{result['pickled_model_bytes'] / 1024:>11.1f}"
+                f"{result['fit_seconds']:>8.2f}"
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+    def evaluate(self, backend, X_train, X_test, y_train, y_test, options):
+        pipeline = backend.pipeline(
+            k=len(expected_features), score_func=f_regression_multioutput, seed=options['seed'],
+        )
+        started = time.perf_counter()
+        pipeline.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+        fitted = backend(**pipeline.named_steps)
+
+        # Batch path: one transform + predict over the whole holdout
+        started = time.perf_counter()
+        predictions = fitted.predict(fitted.transform(X_test))
+        batch_seconds = time.perf_counter() - started
+        errors = np.abs(predictions - y_test).mean(axis=0)
+
+        # Single-row path, as the views call it for each request
+        latencies = []
+        for row in X_test[:options['latency_samples']]:
+            started = time.perf_counter()
+            fitted.predict(fitted.transform(row[np.newaxis, :]))
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+        pickled_bytes, memory_peak = self.measure_memory(fitted, X_test[:1])
+        return {
+            'backend': backend.name,
+            'mae': float(errors.mean()),
+            'mae_by_target': dict(zip(TARGETS, map(float, errors))),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'batch_rows_per_second': len(X_test) / batch_seconds,
+            'memory_peak_bytes': memory_peak,
+            # Serialized size on disk: only a proxy for memory
+            'pickled_model_bytes': pickled_bytes,
+            'fit_seconds': fit_seconds,
+        }
+
+    def measure_memory(self, fitted, row):
+        """
+        Pickle size of the model, and the peak memory traced while a serving
+        process would load it and score one row
+        """
+        blob = pickle.dumps(fitted.model)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            model = pickle.loads(blob)
+            model.predict(fitted.transform(row))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return len(blob), peak
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.model_selection import train_test_split
+
+from userApp.backends import AdaBoostBackend
+from userApp.datasets import DATASET_PATH, load_reference_dataset
+from userApp.ml import artifact_version, backend
+from userApp.pruning import prune_multioutput, removal_order
+
+
+class Command(BaseCommand):
+    help = (
+        "Prune low-weight or redundant estimators from the deployed MultiOutput "
+        "AdaBoost model, report a latency/MAE curve and write the smallest model "
+        "within the accuracy budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=DATASET_PATH)
+        parser.add_argument('--strategy', choices=['greedy', 'weight'], default='greedy')
+        parser.add_argument(
+            '--max-mae-increase', type=float, default=0.005,
+            help="Accuracy budget: allowed holdout MAE increase over the full model.",
+        )
+        parser.add_argument('--sizes', type=int, nargs='+', default=None, help="Estimators per output to evaluate.")
+        parser.add_argument('--validation-size', type=float, default=0.2)
+        parser.add_argument('--test-size', type=float, default=0.2)
+        parser.add_argument('--latency-samples', type=int, default=300)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output-dir', default=None, help="Where to write the pruned artifact set.")
+
+    def handle(self, *args, **options):
+        if not isinstance(backend, AdaBoostBackend):
+            raise CommandError(f"Pruning needs the adaboost backend, {backend.name} is loaded")
+        model = backend.model
+
+        features, targets = load_reference_dataset(options['dataset'])
+        X, y = backend.transform(features.to_numpy()), targets.to_numpy()
+        X_rest, X_test, y_rest, y_test = train_test_split(
+            X, y, test_size=options['test_size'], random_state=options['seed'],
+        )
+        # Pruning never refits, so only the validation share of the rest is used
+        _, X_val, _, y_val = train_test_split(
+            X_rest, y_rest, test_size=options['validation_size'], random_state=options['seed'],
+        )
+        self.stdout.write(
+            "Note: the deployed model may have been trained on these rows, so treat "
+            "MAE as a relative measure between ensemble sizes."
+        )
+
+        started = time.perf_counter()
+        orders = [
+            removal_order(regressor, X_val, y_val[:, i], options['strategy'])
+            for i, regressor in enumerate(model.estimators_)
+        ]
+        self.stdout.write(f"Computed {options['strategy']} removal order in {time.perf_counter() - started:.2f}s")
+
+        full_size = min(len(regressor.estimators_) for regressor in model.estimators_)
+        sizes = sorted(
+            {size for size in (options['sizes'] or [50, 40, 30, 25, 20, 15, 10, 5, 3, 1]) if 1 <= size <= full_size}
+            | {full_size},
+            reverse=True,
+        )
+
+        curve = []
+        self.stdout.write(f"{'estimators':>10}{'MAE':>9}{'p50 ms':>9}{'p99 ms':>9}")
+        for size in sizes:
+            pruned = prune_multioutput(model, orders, size)
+            mae = float(np.abs(pruned.predict(X_test) - y_test).mean())
+            latencies = []
+            for row in X_test[:options['latency_samples']]:
+                started = time.perf_counter()
+                pruned.predict(row[np.newaxis, :])
+                latencies.append((time.perf_counter() - started) * 1000.0)
+            point = {
+                'estimators_per_output': size,
+                'mae': mae,
+                'p50_ms': float(np.percentile(latencies, 50)),
+                'p99_ms': float(np.percentile(latencies, 99)),
+            }
+            curve.append(point)
+            self.stdout.write(f"{size:>10}{mae:>9.4f}{point['p50_ms']:>9.3f}{point['p99_ms']:>9.3f}")
+
+        budget = curve[0]['mae'] + options['max_mae_increase']
+        chosen = min((p for p in curve if p['mae'] <= budget), key=lambda p: p['estimators_per_output'])
+        self.stdout.write(
+            f"Smallest ensemble within +{options['max_mae_increase']} MAE: "
+            f"{chosen['estimators_per_output']} estimators per output"
+        )
+
+        if options['output_dir']:
+            pruned = prune_multioutput(model, orders, chosen['estimators_per_output'])
+            AdaBoostBackend(pruned, backend.scaler, backend.feature_selector).save(options['output_dir'])
+            report = {
+                'version': artifact_version(options['output_dir'], AdaBoostBackend),
+                'strategy': options['strategy'],
+                'max_mae_increase': options['max_mae_increase'],
+                'chosen': chosen,
+                'curve': curve,
+            }
+            with open(os.path.join(options['output_dir'], 'pruning_report.json'), 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote pruned model version {report['version']} to {options['output_dir']}"
+            ))
@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from userApp.models import AssessmentResult, Prediction, UserResponse
+from userApp.results import detached_cutoff, result_cache_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the assessment retention policy: delete responses (and their "
+        "predictions) or unlink them from user accounts once they are older "
+        "than the retention period, in short transactions of consecutive rows. "
+        "Result pages without a stored response are deleted after RESULT_CACHE_TTL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.RETENTION_DAYS)
+        parser.add_argument('--mode', choices=['delete', 'anonymize'], default=settings.RETENTION_MODE)
+        parser.add_argument('--batch-size', type=int, default=500, help="Responses per transaction.")
+        parser.add_argument('--sleep', type=float, default=0.0, help="Seconds to pause between batches.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the rows that would change.")
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError("Set --days or RETENTION_DAYS to a positive number of days")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        self.purge_detached_results(options)
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = UserResponse.objects.filter(submitted_at__lt=cutoff)
+        if options['mode'] == 'anonymize':
+            expired = expired.filter(user__isnull=False)
+
+        if not expired.exists():
+            self.stdout.write(f"No responses submitted before {cutoff:%Y-%m-%d} to {options['mode']}")
+            return
+        if options['dry_run']:
+            self.stdout.write(f"Would {options['mode']} {expired.count()} responses submitted before {cutoff:%Y-%m-%d}")
+            return
+
+        processed = predictions = 0
+        started = time.perf_counter()
+        last_pk = 0
+        while True:
+            # Keyset batches: sparse ids never yield empty or oversized transactions
+            pks = list(
+                expired.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not pks:
+                break
+            last_pk = pks[-1]
+            batch = expired.filter(pk__in=pks)
+            with transaction.atomic():
+                if options['mode'] == 'delete':
+                    # Cascades to this batch's predictions and stored results only
+                    _, deleted = batch.delete()
+                    processed += deleted.get(UserResponse._meta.label, 0)
+                    predictions += deleted.get(Prediction._meta.label, 0)
+                else:
+                    # Cached result pages still name their former owner
+                    keys = [
+                        result_cache_key(pk)
+                        for pk in AssessmentResult.objects.filter(user_response__in=batch).values_list('pk', flat=True)
+                    ]
+                    processed += batch.update(user=None)
+                    transaction.on_commit(lambda keys=keys: cache.delete_many(keys))
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.perf_counter() - started
+        verb = 'Deleted' if options['mode'] == 'delete' else 'Anonymized'
+        extra = f" and {predictions} predictions" if options['mode'] == 'delete' else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {processed} responses{extra} submitted before {cutoff:%Y-%m-%d} in {elapsed:.2f}s "
+            f"({(processed + predictions) / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
+
+    def purge_detached_results(self, options):
+        """Delete expired result pages of anonymous visitors and unsaved responses"""
+        expired = AssessmentResult.objects.filter(user_response__isnull=True, created_at__lt=detached_cutoff())
+        if options['dry_run']:
+            self.stdout.write(f"Would delete {expired.count()} expired result pages without a stored response")
+            return
+        deleted = 0
+        last_pk = None
+        while True:
+            remaining = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+            pks = list(remaining.order_by('pk').values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic():
+                # Their cache entries go with them, see userApp.signals
+                deleted += expired.filter(pk__in=pks).delete()[0]
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        if deleted:
+            self.stdout.write(f"Deleted {deleted} expired result pages without a stored response")
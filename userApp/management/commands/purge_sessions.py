@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired database sessions in primary-key chunks, so a large "
+        "django_session table is never locked by one full-table DELETE like "
+        "clearsessions issues."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.0, help="Seconds to pause between chunks.")
+        parser.add_argument('--limit', type=int, default=None, help="Stop after deleting this many sessions.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive")
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write("Sessions are stored in signed cookies; nothing to purge")
+            return
+
+        # Fixed cutoff so sessions expiring mid-run are left for the next run
+        cutoff = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=cutoff).order_by('pk')
+
+        deleted = 0
+        started = time.perf_counter()
+        while options['limit'] is None or deleted < options['limit']:
+            size = chunk_size if options['limit'] is None else min(chunk_size, options['limit'] - deleted)
+            keys = list(expired.values_list('pk', flat=True)[:size])
+            if not keys:
+                break
+            # A session extended since it was selected is no longer expired
+            deleted += Session.objects.filter(pk__in=keys, expire_date__lt=cutoff).delete()[0]
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} expired sessions in {elapsed:.2f}s "
+            f"({deleted / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
@@ -0,0 +1,163 @@
+import json
+import os
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from joblib import Parallel, delayed
+
+from userApp.choices import FEATURE_FIELDS
+from userApp.datasets import load_reference_dataset
+from userApp.ml import MODEL_VERSION, model, transform_features
+from userApp.models import Prediction, UserResponse
+
+
+class Command(BaseCommand):
+    help = (
+        "Score every UserResponse that has no Prediction for the current model "
+        "version. Safe to interrupt: rerunning continues after the last "
+        "committed chunk. Rows with a missing answer are skipped unless "
+        "--impute-missing fills it in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Processes scoring chunks in parallel (joblib n_jobs).",
+        )
+        parser.add_argument(
+            '--checkpoint', default=None,
+            help="JSON file recording the last committed UserResponse id.",
+        )
+        parser.add_argument('--limit', type=int, default=None, help="Stop after this many responses.")
+        parser.add_argument(
+            '--impute-missing', action='store_true',
+            help="Fill missing answers, such as course on responses saved before it was asked, with the most "
+                 "common Dataset.csv answer instead of skipping the row. Such predictions are marked imputed.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        checkpoint = options['checkpoint']
+        if chunk_size < 1 or workers < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        fill = self.reference_modes() if options['impute_missing'] else None
+        last_id = self.read_checkpoint(checkpoint)
+        pending = (
+            UserResponse.objects
+            .exclude(prediction__model_version=MODEL_VERSION)
+            .order_by('id')
+            .values_list('id', *FEATURE_FIELDS.values())
+        )
+        self.stdout.write(f"Rescoring for model version {MODEL_VERSION}, starting after id {last_id}")
+
+        scored = skipped = imputed = 0
+        started = time.perf_counter()
+        with Parallel(n_jobs=workers) as parallel:
+            while options['limit'] is None or scored + skipped < options['limit']:
+                # Pull one chunk per worker, score them together, commit in order
+                chunks = []
+                remaining = None if options['limit'] is None else options['limit'] - scored - skipped
+                for _ in range(workers):
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    rows = list(pending.filter(id__gt=last_id)[:size]) if size > 0 else []
+                    if not rows:
+                        break
+                    if remaining is not None:
+                        remaining -= len(rows)
+                    chunks.append(rows)
+                    last_id = rows[-1][0]
+                if not chunks:
+                    break
+
+                prepared = [self.prepare(rows, fill) for rows in chunks]
+                # The bound estimator method keeps Django out of the worker processes
+                results = parallel(
+                    delayed(model.predict)(matrix)
+                    for _, matrix, _, _ in prepared if len(matrix)
+                )
+                results = iter(results)
+                for rows, (ids, matrix, filled, missing) in zip(chunks, prepared):
+                    predictions = next(results) if len(matrix) else []
+                    self.save(ids, predictions, filled)
+                    self.write_checkpoint(checkpoint, rows[-1][0])
+                    scored += len(ids)
+                    imputed += int(filled.sum())
+                    skipped += missing
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {scored} scored ({imputed} imputed), {skipped} skipped, up to id {last_id} "
+                    f"({scored / elapsed:.0f} rows/s)"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {scored} responses scored ({imputed} with imputed answers), "
+            f"{skipped} skipped for missing answers"
+        ))
+        if skipped and fill is None:
+            self.stdout.write("Rerun with --impute-missing to score the skipped responses")
+
+    def reference_modes(self):
+        """The most common encoded Dataset.csv answer per feature, in FEATURE_FIELDS order"""
+        features, _ = load_reference_dataset()
+        return np.array([features[feature].mode().iloc[0] for feature in FEATURE_FIELDS], dtype=float)
+
+    def prepare(self, rows, fill=None):
+        """
+        Split a chunk into scoreable ids, their model-ready matrix, which of
+        them had answers filled in from `fill`, and how many were skipped
+        """
+        matrix = np.array(
+            [[np.nan if value is None else float(value) for value in row[1:]] for row in rows],
+            dtype=float,
+        )
+        missing = np.isnan(matrix)
+        filled = missing.any(axis=1)
+        if fill is not None:
+            matrix = np.where(missing, fill, matrix)
+            complete = np.ones(len(rows), dtype=bool)
+        else:
+            complete = ~filled
+            filled = np.zeros(len(rows), dtype=bool)
+        ids = [row[0] for row, ok in zip(rows, complete) if ok]
+        matrix = matrix[complete]
+        if len(matrix):
+            matrix = transform_features(matrix)
+        return ids, matrix, filled[complete], int((~complete).sum())
+
+    def save(self, ids, predictions, filled):
+        with transaction.atomic():
+            Prediction.objects.bulk_create([
+                Prediction(
+                    user_response_id=response_id,
+                    stress_level=round(float(scores[0]), 2),
+                    depression_score=round(float(scores[1]), 2),
+                    anxiety_score=round(float(scores[2]), 2),
+                    model_version=MODEL_VERSION,
+                    imputed=bool(was_filled),
+                )
+                for response_id, scores, was_filled in zip(ids, predictions, filled)
+            ])
+
+    def read_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            state = json.load(f)
+        if state.get('model_version') != MODEL_VERSION:
+            self.stdout.write("Checkpoint is for another model version, starting over")
+            return 0
+        return state.get('last_id', 0)
+
+    def write_checkpoint(self, path, last_id):
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'model_version': MODEL_VERSION, 'last_id': last_id}, f)
+        os.replace(tmp_path, path)
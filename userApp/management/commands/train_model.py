@@ -0,0 +1,130 @@
+import json
+import os
+import time
+
+import pandas as pd
+import sklearn
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from sklearn.model_selection import KFold, cross_validate
+
+from userApp.backends import BACKENDS, f_regression_multioutput, get_backend
+from userApp.datasets import (
+    DATASET_PATH, TARGETS, file_hash, load_reference_dataset, load_stored_responses,
+)
+from userApp.ml import artifact_version, expected_features
+
+
+class Command(BaseCommand):
+    help = (
+        "Retrain the scaler, feature selector and multi-output model from "
+        "Dataset.csv and write a versioned artifact set with a metrics report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=DATASET_PATH)
+        parser.add_argument('--backend', default='adaboost', choices=sorted(BACKENDS))
+        parser.add_argument(
+            '--include-responses', action='store_true',
+            help="Also train on stored UserResponse rows labelled with their latest Prediction.",
+        )
+        parser.add_argument('--k', type=int, default=len(expected_features), help="Features kept by SelectKBest.")
+        parser.add_argument('--n-estimators', type=int, default=None, help="Defaults to the backend's own.")
+        parser.add_argument('--learning-rate', type=float, default=None, help="Defaults to the backend's own.")
+        parser.add_argument('--folds', type=int, default=5, help="Cross-validation folds (0 to skip).")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--n-jobs', type=int, default=-1,
+            help="Parallel jobs for CV folds and the final fit; saved models predict in-process.",
+        )
+        parser.add_argument(
+            '--output-dir', default=os.path.join(settings.BASE_DIR, 'userApp', 'Ml_models', 'versions'),
+            help="Each run writes a timestamped subdirectory here.",
+        )
+        parser.add_argument(
+            '--cache-dir', default=settings.DATASET_CACHE_DIR,
+            help="Columnar cache of the encoded dataset, keyed by its hash.",
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options['k'] <= len(expected_features):
+            raise CommandError(f"--k must be between 1 and {len(expected_features)}")
+        timings = {}
+
+        started = time.perf_counter()
+        dataset_hash = file_hash(options['dataset'])
+        features, targets = load_reference_dataset(options['dataset'], cache_dir=options['cache_dir'])
+        sources = {'dataset': len(features)}
+        if options['include_responses']:
+            stored_features, stored_targets = load_stored_responses()
+            sources['responses'] = len(stored_features)
+            features = pd.concat([features, stored_features], ignore_index=True)
+            targets = pd.concat([targets, stored_targets], ignore_index=True)
+        timings['load_seconds'] = time.perf_counter() - started
+        self.stdout.write(f"Loaded {len(features)} rows {sources} in {timings['load_seconds']:.2f}s")
+
+        backend = get_backend(options['backend'])
+        params = {
+            'k': options['k'],
+            'score_func': f_regression_multioutput,
+            'n_estimators': options['n_estimators'],
+            'learning_rate': options['learning_rate'],
+            'seed': options['seed'],
+        }
+        X, y = features.to_numpy(), targets.to_numpy()
+
+        metrics = {}
+        if options['folds'] > 1:
+            started = time.perf_counter()
+            # Folds run in parallel, so each fold fits its three outputs serially
+            scores = cross_validate(
+                backend.pipeline(n_jobs=1, **params), X, y,
+                cv=KFold(options['folds'], shuffle=True, random_state=options['seed']),
+                scoring=['neg_mean_absolute_error', 'r2'],
+                n_jobs=options['n_jobs'],
+            )
+            timings['cv_seconds'] = time.perf_counter() - started
+            metrics = {
+                'cv_folds': options['folds'],
+                'cv_mae_mean': float(-scores['test_neg_mean_absolute_error'].mean()),
+                'cv_mae_std': float(scores['test_neg_mean_absolute_error'].std()),
+                'cv_r2_mean': float(scores['test_r2'].mean()),
+            }
+            self.stdout.write(
+                f"CV MAE {metrics['cv_mae_mean']:.4f} ± {metrics['cv_mae_std']:.4f} "
+                f"in {timings['cv_seconds']:.2f}s"
+            )
+
+        started = time.perf_counter()
+        pipeline = backend.pipeline(n_jobs=options['n_jobs'], **params).fit(X, y)
+        timings['fit_seconds'] = time.perf_counter() - started
+        predictions = pipeline.predict(X)
+        metrics['train_mae'] = {
+            target: float(abs(predictions[:, i] - y[:, i]).mean())
+            for i, target in enumerate(TARGETS)
+        }
+        self.stdout.write(f"Fitted final model in {timings['fit_seconds']:.2f}s")
+
+        version_dir = os.path.join(options['output_dir'], timezone.now().strftime('%Y%m%d-%H%M%S'))
+        backend(**pipeline.named_steps).save(version_dir)
+
+        report = {
+            'version': artifact_version(version_dir, backend),
+            'backend': backend.name,
+            'trained_at': timezone.now().isoformat(),
+            'dataset': os.path.basename(options['dataset']),
+            'dataset_sha256': dataset_hash,
+            'rows': sources,
+            'params': {key: value for key, value in params.items() if key != 'score_func'},
+            'sklearn_version': sklearn.__version__,
+            'metrics': metrics,
+            'timings': timings,
+        }
+        with open(os.path.join(version_dir, 'report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote model version {report['version']} to {version_dir} "
+            f"(deploy with ML_MODEL_DIR={version_dir} ML_BACKEND={backend.name})"
+        ))
@@ -0,0 +1,119 @@
+import cProfile
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+PROFILE_CACHE_TIMEOUT = 3600
+
+# tracemalloc is process-wide, so only one request is profiled at a time
+_profiling = threading.Lock()
+
+
+def profile_cache_key(profile_id):
+    return f'profile:{profile_id}'
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile a single request on demand for staff users.
+
+    Sending an X-Profile header or a ?_profile query parameter runs the view
+    under cProfile and tracemalloc. The report (top functions by cumulative
+    time, top allocation sites) is cached under the id returned in the
+    X-Profile-Id response header, or returned instead of the response when
+    the flag's value is "inline". Requests without the flag only pay for
+    two dictionary lookups.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        flag = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+        if not flag or not settings.PROFILING_ENABLED or not request.user.is_staff:
+            return self.get_response(request)
+        if not _profiling.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile'] = 'busy'
+            return response
+        try:
+            return self.profile(request, inline=flag == 'inline')
+        finally:
+            _profiling.release()
+
+    def profile(self, request, inline):
+        # Views check this to call the model in-thread instead of via the micro-batcher
+        request.profiling = True
+        profiler = cProfile.Profile()
+        tracemalloc.start(settings.PROFILING_TRACEBACK_DEPTH)
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                # Left enabled, cProfile would keep tracing this thread's later requests
+                profiler.disable()
+            wall = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        report = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'wall_ms': wall * 1000.0,
+            'peak_allocated_kb': peak / 1024.0,
+            'functions': top_functions(profiler, settings.PROFILING_TOP_N),
+            'allocations': top_allocations(snapshot, settings.PROFILING_TOP_N),
+        }
+        profile_id = uuid.uuid4().hex
+        cache.set(profile_cache_key(profile_id), report, PROFILE_CACHE_TIMEOUT)
+        logger.info(f"Profiled {request.method} {request.path} in {report['wall_ms']:.1f}ms as {profile_id}")
+
+        if inline:
+            response = JsonResponse(report)
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+def top_functions(profiler, limit):
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'own_ms': own * 1000.0,
+            'cumulative_ms': cumulative * 1000.0,
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+def top_allocations(snapshot, limit):
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+    ])
+    return [
+        {
+            'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+            'size_kb': stat.size / 1024.0,
+            'count': stat.count,
+        }
+        for stat in snapshot.statistics('lineno')[:limit]
+    ]
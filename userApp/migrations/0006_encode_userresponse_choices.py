@@ -0,0 +1,89 @@
+from django.db import migrations, models
+
+# Frozen copy of the label -> code mappings from userApp.choices at the time
+# of this migration. CharField(max_length=10) may have truncated longer
+# labels on some backends, so the first 10 characters are accepted as well.
+CODES = {
+    'gender': {'Male': 0, 'Female': 1, 'Others': 2},
+    'sleep_quality': {'Good': 0, 'Average': 1, 'Poor': 2},
+    'physical_activity': {'Low': 0, 'Moderate': 1, 'High': 2},
+    'diet_quality': {'Good': 0, 'Average': 1, 'Poor': 2},
+    'social_support': {'Low': 0, 'Moderate': 1, 'High': 2},
+    'relationship_status': {'Single': 0, 'In a relationship': 1, 'Married': 2},
+    'substance_use': {'Never': 0, 'Occasionally': 1, 'Frequently': 2},
+    'counseling_service_use': {'Never': 0, 'Occasionally': 1, 'Frequently': 2},
+    'family_history': {'No': 0, 'Yes': 1},
+    'chronic_illness': {'No': 0, 'Yes': 1},
+    'extracurricular_involvement': {'Low': 0, 'Moderate': 1, 'High': 2},
+    'residence_type': {'On-Campus': 0, 'Off-Campus': 1, 'With Family': 2},
+}
+NULLABLE = {
+    'substance_use', 'counseling_service_use', 'family_history',
+    'chronic_illness', 'extracurricular_involvement', 'residence_type',
+}
+BATCH_SIZE = 1000
+
+
+def convert(apps, lookup):
+    UserResponse = apps.get_model('userApp', 'UserResponse')
+    fields = list(CODES)
+    batch = []
+    for response in UserResponse.objects.only('id', *fields).iterator(chunk_size=BATCH_SIZE):
+        for field in fields:
+            value = getattr(response, field)
+            if value is None or value == '':
+                converted = None
+            else:
+                converted = lookup[field].get(value)
+                if converted is None:
+                    raise ValueError(f"Cannot convert {field}={value!r} on UserResponse {response.id}")
+            if converted is None and field not in NULLABLE:
+                raise ValueError(f"Missing {field} on UserResponse {response.id}")
+            setattr(response, field, converted)
+        batch.append(response)
+        if len(batch) >= BATCH_SIZE:
+            UserResponse.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        UserResponse.objects.bulk_update(batch, fields)
+
+
+def labels_to_codes(apps, schema_editor):
+    lookup = {}
+    for field, codes in CODES.items():
+        lookup[field] = {}
+        for label, code in codes.items():
+            lookup[field][label] = str(code)
+            lookup[field][label[:10]] = str(code)
+        # Rows already holding codes are left as they are
+        lookup[field].update({str(code): str(code) for code in codes.values()})
+    convert(apps, lookup)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0005_prediction_predict_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userresponse",
+            name="course",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[
+                    (0, "Engineering"),
+                    (1, "Business"),
+                    (2, "Computer"),
+                    (3, "Law"),
+                    (4, "Medical"),
+                    (5, "Other"),
+                ],
+                null=True,
+            ),
+        ),
+        # Irreversible: the old CharField(10) columns cannot hold labels such as
+        # 'In a relationship', so converting back would truncate answers
+        migrations.RunPython(labels_to_codes),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userApp', '0006_encode_userresponse_choices'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userresponse',
+            name='chronic_illness',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Yes'), (0, 'No')], null=True),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='counseling_service_use',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'Never'), (1, 'Occasionally'), (2, 'Frequently')], null=True),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='diet_quality',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Good'), (1, 'Average'), (2, 'Poor')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='extracurricular_involvement',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'Low'), (1, 'Moderate'), (2, 'High')], null=True),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='family_history',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Yes'), (0, 'No')], null=True),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='gender',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Male'), (1, 'Female'), (2, 'Others')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='physical_activity',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Low'), (1, 'Moderate'), (2, 'High')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='relationship_status',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Single'), (1, 'In a relationship'), (2, 'Married')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='residence_type',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'On-Campus'), (1, 'Off-Campus'), (2, 'With Family')], null=True),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='sleep_quality',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Good'), (1, 'Average'), (2, 'Poor')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='social_support',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Low'), (1, 'Moderate'), (2, 'High')]),
+        ),
+        migrations.AlterField(
+            model_name='userresponse',
+            name='substance_use',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'Never'), (1, 'Occasionally'), (2, 'Frequently')], null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 17:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0007_alter_userresponse_choice_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prediction",
+            name="model_version",
+            field=models.CharField(blank=True, default="", max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name="prediction",
+            index=models.Index(
+                fields=["model_version", "user_response"], name="prediction_version_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 17:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0008_prediction_model_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="prediction",
+            index=models.Index(fields=["predict_date"], name="prediction_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="prediction",
+            index=models.Index(fields=["stress_level"], name="prediction_stress_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="prediction",
+            index=models.Index(
+                fields=["depression_score"], name="prediction_depression_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="prediction",
+            index=models.Index(fields=["anxiety_score"], name="prediction_anxiety_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userresponse",
+            index=models.Index(fields=["course"], name="userresponse_course_idx"),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-19 17:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_submitted_at(apps, schema_editor):
+    # Existing responses were saved together with their first prediction;
+    # responses without one keep the migration time
+    UserResponse = apps.get_model("userApp", "UserResponse")
+    responses = (
+        UserResponse.objects.annotate(
+            first_prediction=models.Min("prediction__predict_date")
+        )
+        .filter(first_prediction__isnull=False)
+        .only("id")
+        .order_by("id")
+    )
+    batch = []
+    for response in responses.iterator(chunk_size=BATCH_SIZE):
+        response.submitted_at = response.first_prediction
+        batch.append(response)
+        if len(batch) >= BATCH_SIZE:
+            UserResponse.objects.bulk_update(batch, ["submitted_at"])
+            batch = []
+    if batch:
+        UserResponse.objects.bulk_update(batch, ["submitted_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0009_admin_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userresponse",
+            name="submitted_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+        migrations.RunPython(backfill_submitted_at, migrations.RunPython.noop),
+    ]
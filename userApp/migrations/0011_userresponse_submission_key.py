@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 17:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0010_userresponse_submitted_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userresponse",
+            name="submission_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="userresponse",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("submission_key__isnull", False)),
+                fields=("user", "submission_key"),
+                name="userresponse_unique_submission",
+            ),
+        ),
+    ]
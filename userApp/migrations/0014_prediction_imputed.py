@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userApp", "0013_detached_assessment_results"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prediction",
+            name="imputed",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,71 @@
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+
+# f_regression_multioutput is re-exported for selectors pickled before it moved to backends
+from .backends import f_regression_multioutput, get_backend  # noqa: F401
+from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS, encoding
+from .explanations import build_explainer
+
+logger = logging.getLogger(__name__)
+
+# Define the expected features in the exact order your model expects them
+expected_features = list(FEATURE_FIELDS)
+
+
+def artifact_version(model_dir, backend):
+    """Short content hash identifying a set of model artifacts"""
+    digest = hashlib.sha256()
+    for filename in sorted(backend.artifact_files().values()):
+        with open(os.path.join(model_dir, filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# Load all required models and preprocessing objects through the configured backend
+model_dir = settings.ML_MODEL_DIR
+
+try:
+    backend = get_backend(settings.ML_BACKEND).load(model_dir)
+    MODEL_VERSION = settings.ML_MODEL_VERSION or artifact_version(model_dir, backend)
+except Exception as e:
+    logger.error(f"Failed to load ML models: {str(e)}")
+    raise ImportError(f"Failed to load ML models: {str(e)}")
+
+model = backend.model
+feature_selector = backend.feature_selector
+scaler = backend.scaler
+
+# Tree path attributions are precomputed once here; None for non-AdaBoost backends
+explainer = build_explainer(backend)
+
+
+def clean_numeric_input(value):
+    """Clean and convert numeric input to float"""
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        # Remove any non-numeric characters except decimal point and minus
+        value = ''.join(c for c in value if c.isdigit() or c in {'.', '-'})
+        if not value:  # Handle empty string after cleaning
+            return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0  # Default value if conversion fails
+
+
+def manual_encode(df):
+    for feature, field in FEATURE_FIELDS.items():
+        if field in CATEGORICAL_FIELDS:
+            df[feature] = df[feature].map(encoding(CATEGORICAL_FIELDS[field]))
+    df['Financial_Stress'] = df['Financial_Stress'].apply(clean_numeric_input)
+
+    return df
+
+
+def transform_features(matrix):
+    """Scale and select encoded feature rows the way the model was trained"""
+    return backend.transform(matrix)
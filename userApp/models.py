@@ -1,27 +1,73 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
+from .choices import (
+    CATEGORICAL_FIELDS, FEATURE_FIELDS, Course, Frequency, Gender, Level, Quality,
+    RelationshipStatus, ResidenceType, YesNo, encode,
+)
 
 class UserResponse(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     age = models.IntegerField()
-    gender = models.CharField(max_length=10)
+    gender = models.PositiveSmallIntegerField(choices=Gender.choices)
+    course = models.PositiveSmallIntegerField(choices=Course.choices, blank=True, null=True)
     cgpa = models.DecimalField(max_digits=3, decimal_places=2)
     semester_credit_load = models.IntegerField()
-    sleep_quality = models.CharField(max_length=10)
-    physical_activity = models.CharField(max_length=10)
-    diet_quality = models.CharField(max_length=10)
-    social_support = models.CharField(max_length=10)
-    relationship_status = models.CharField(max_length=10)
+    sleep_quality = models.PositiveSmallIntegerField(choices=Quality.choices)
+    physical_activity = models.PositiveSmallIntegerField(choices=Level.choices)
+    diet_quality = models.PositiveSmallIntegerField(choices=Quality.choices)
+    social_support = models.PositiveSmallIntegerField(choices=Level.choices)
+    relationship_status = models.PositiveSmallIntegerField(choices=RelationshipStatus.choices)
     financial_stress = models.IntegerField()
-    substance_use = models.CharField(max_length=10, blank=True, null=True)
-    counseling_service_use = models.CharField(max_length=10, blank=True, null=True)
-    family_history = models.CharField(max_length=10, blank=True, null=True)
-    chronic_illness = models.CharField(max_length=10, blank=True, null=True)
-    extracurricular_involvement = models.CharField(max_length=10, blank=True, null=True)
-    residence_type = models.CharField(max_length=10, blank=True, null=True)
+    substance_use = models.PositiveSmallIntegerField(choices=Frequency.choices, blank=True, null=True)
+    counseling_service_use = models.PositiveSmallIntegerField(choices=Frequency.choices, blank=True, null=True)
+    family_history = models.PositiveSmallIntegerField(choices=YesNo.choices, blank=True, null=True)
+    chronic_illness = models.PositiveSmallIntegerField(choices=YesNo.choices, blank=True, null=True)
+    extracurricular_involvement = models.PositiveSmallIntegerField(choices=Level.choices, blank=True, null=True)
+    residence_type = models.PositiveSmallIntegerField(choices=ResidenceType.choices, blank=True, null=True)
+    submitted_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # Digest of the form's submission token and answers, so a resubmitted form is stored once
+    submission_key = models.CharField(max_length=64, blank=True, null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['course'], name='userresponse_course_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'submission_key'],
+                condition=models.Q(submission_key__isnull=False),
+                name='userresponse_unique_submission',
+            ),
+        ]
+
+    @classmethod
+    def from_form_data(cls, user_data, **kwargs):
+        """Build a response from form labels, storing categorical answers as codes"""
+        values = {
+            field: encode(choices, user_data.get(field))
+            for field, choices in CATEGORICAL_FIELDS.items()
+        }
+        return cls(
+            age=float(user_data['age']),
+            cgpa=float(user_data['cgpa']),
+            semester_credit_load=float(user_data['semester_credit_load']),
+            financial_stress=float(user_data['financial_stress']),
+            **values,
+            **kwargs,
+        )
+
+    def feature_row(self):
+        """Encoded feature values in the order the model expects"""
+        return [
+            float('nan') if getattr(self, field) is None else float(getattr(self, field))
+            for field in FEATURE_FIELDS.values()
+        ]
 
     def __str__(self):
         return f"Response #{self.id}"
@@ -32,9 +78,44 @@ class Prediction(models.Model):
     depression_score = models.DecimalField(max_digits=3, decimal_places=2)
     anxiety_score = models.DecimalField(max_digits=3, decimal_places=2)
     predict_date = models.DateTimeField(default=timezone.now)
+    model_version = models.CharField(max_length=40, blank=True, default='')
+    # Scored with missing answers filled in (rescore_predictions --impute-missing)
+    imputed = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_version', 'user_response'], name='prediction_version_idx'),
+            models.Index(fields=['predict_date'], name='prediction_date_idx'),
+            # The admin's Low/Moderate/High filters are range scans on these
+            models.Index(fields=['stress_level'], name='prediction_stress_idx'),
+            models.Index(fields=['depression_score'], name='prediction_depression_idx'),
+            models.Index(fields=['anxiety_score'], name='prediction_anxiety_idx'),
+        ]
 
     def __str__(self):
         return f"Prediction for {self.user_response}"
+
+
+class AssessmentResult(models.Model):
+    """
+    The result page of one assessment, so revisiting it needs no inference.
+
+    Results of stored responses belong to the response's user. Results
+    without a response (anonymous visitors, or a response that failed to
+    save) are public or owned by `owner`, and purge_responses deletes them
+    after RESULT_CACHE_TTL seconds.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_response = models.OneToOneField(
+        UserResponse, on_delete=models.CASCADE, related_name='result', null=True, blank=True,
+    )
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    public = models.BooleanField(default=False)
+    context = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Result for {self.user_response or self.owner or 'anonymous visitor'}"
     
 
 class Profile(models.Model):
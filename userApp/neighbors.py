@@ -0,0 +1,83 @@
+import logging
+import time
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+from .insights import LEVEL_THRESHOLDS, TARGET_KEYS
+from .refresh import PeriodicRefresh
+
+logger = logging.getLogger(__name__)
+
+# Never aggregate over fewer profiles than this, so no single answer stands out
+MIN_NEIGHBORS = 10
+
+
+class SimilarProfiles(PeriodicRefresh):
+    """
+    "Students like you": a KD-tree over Dataset.csv rows and stored responses
+    in the scaled, selected space the model sees, answering k-NN queries with
+    aggregate outcomes only.
+
+    Dataset.csv rows carry their surveyed scores; stored responses carry
+    their latest prediction. The tree is rebuilt in the background every
+    `refresh_seconds` to take in new responses.
+    """
+
+    def __init__(self, backend, features, outcomes, k=25, refresh_seconds=3600, leaf_size=40):
+        super().__init__(refresh_seconds)
+        self.backend = backend
+        self.k = max(k, MIN_NEIGHBORS)
+        self.leaf_size = leaf_size
+        self.reference = (np.asarray(features, dtype=float), np.asarray(outcomes, dtype=float))
+        self.index = self._build(*self.reference)
+
+    @classmethod
+    def from_reference_dataset(cls, backend, **kwargs):
+        from .datasets import load_reference_dataset
+
+        features, targets = load_reference_dataset()
+        return cls(backend, features.to_numpy(), targets.to_numpy(), **kwargs)
+
+    def _build(self, features, outcomes):
+        started = time.perf_counter()
+        tree = KDTree(self.backend.transform(features), leaf_size=self.leaf_size)
+        memory = sum(array.nbytes for array in tree.get_arrays()) + outcomes.nbytes
+        stats = {
+            'profiles': len(outcomes),
+            'memory_bytes': memory,
+            'build_seconds': time.perf_counter() - started,
+        }
+        logger.info(f"Built similar-profile index: {stats}")
+        return tree, outcomes, stats
+
+    def refresh(self):
+        from .datasets import load_stored_responses
+
+        stored_features, stored_targets = load_stored_responses()
+        features, outcomes = self.reference
+        self.index = self._build(
+            np.vstack([features, stored_features.to_numpy()]),
+            np.vstack([outcomes, stored_targets.to_numpy()]),
+        )
+
+    def stats(self):
+        return dict(self.index[2])
+
+    def query(self, X):
+        """Mean outcome and share at the High level among the first row's nearest profiles"""
+        self.maybe_refresh()
+        tree, outcomes, stats = self.index
+        k = min(self.k, stats['profiles'])
+        if k < MIN_NEIGHBORS:
+            return None
+        _, indices = tree.query(np.asarray(X, dtype=float)[:1], k=k)
+        neighbors = outcomes[indices[0]]
+        return {
+            'count': k,
+            'mean': {key: float(neighbors[:, i].mean()) for i, key in enumerate(TARGET_KEYS)},
+            'high_share': {
+                key: float((neighbors[:, i] >= LEVEL_THRESHOLDS[key][1]).mean())
+                for i, key in enumerate(TARGET_KEYS)
+            },
+        }
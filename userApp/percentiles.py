@@ -0,0 +1,121 @@
+import bisect
+import logging
+
+import numpy as np
+
+from .choices import FEATURE_FIELDS
+from .insights import TARGET_KEYS
+from .refresh import PeriodicRefresh
+
+logger = logging.getLogger(__name__)
+
+COHORT_FIELDS = ['course', 'gender']
+
+# Smaller cohorts give percentiles too noisy to show
+MIN_COHORT_SIZE = 30
+
+
+class ScoreDistribution:
+    """
+    Sorted score lists per output, for the whole population and for each
+    Course and Gender cohort, so a percentile is two bisections.
+    """
+
+    def __init__(self, scores, cohorts):
+        scores = np.asarray(scores, dtype=float).reshape(-1, len(TARGET_KEYS))
+        self.size = len(scores)
+        self.sorted = {None: self._sorted_columns(scores)}
+        for field, codes in cohorts.items():
+            codes = np.asarray(codes, dtype=float)
+            for code in np.unique(codes[~np.isnan(codes)]):
+                members = scores[codes == code]
+                if len(members) >= MIN_COHORT_SIZE:
+                    self.sorted[(field, int(code))] = self._sorted_columns(members)
+
+    @staticmethod
+    def _sorted_columns(scores):
+        return [np.sort(scores[:, i]).tolist() for i in range(scores.shape[1])]
+
+    def percentile(self, output, score, cohort=None):
+        """Mid-rank percentile of `score` in the cohort, or None if the cohort is too small"""
+        columns = self.sorted.get(cohort)
+        if columns is None:
+            return None
+        values = columns[output]
+        below = bisect.bisect_left(values, score)
+        at_or_below = bisect.bisect_right(values, score)
+        return 100.0 * (below + at_or_below) / (2 * len(values))
+
+    def rank(self, scores, course=None, gender=None):
+        """Percentiles of one row of scores, overall and within the row's cohorts"""
+        cohorts = {'course': course, 'gender': gender}
+        ranks = {}
+        for i, (key, score) in enumerate(zip(TARGET_KEYS, scores)):
+            score = float(score)
+            ranks[key] = {'overall': self.percentile(i, score)}
+            for field, code in cohorts.items():
+                ranks[key][field] = None if code is None else self.percentile(i, score, (field, code))
+        return ranks
+
+
+def reference_scores(backend):
+    """Model scores and cohort codes for every scorable Dataset.csv row"""
+    from .datasets import load_reference_dataset
+
+    features, _ = load_reference_dataset()
+    X = features.to_numpy()
+    columns = list(FEATURE_FIELDS.values())
+    cohorts = {field: X[:, columns.index(field)] for field in COHORT_FIELDS}
+    return backend.predict(backend.transform(X)), cohorts
+
+
+def stored_scores(model_version):
+    """Stored predictions from `model_version` with their responses' cohort codes"""
+    from .models import Prediction
+
+    rows = np.array(
+        list(
+            Prediction.objects
+            .filter(model_version=model_version)
+            .values_list(
+                'stress_level', 'depression_score', 'anxiety_score',
+                *(f'user_response__{field}' for field in COHORT_FIELDS),
+            )
+            .iterator(chunk_size=5000)
+        ),
+        dtype=float,
+    ).reshape(-1, len(TARGET_KEYS) + len(COHORT_FIELDS))
+    cohorts = {field: rows[:, len(TARGET_KEYS) + i] for i, field in enumerate(COHORT_FIELDS)}
+    return rows[:, :len(TARGET_KEYS)], cohorts
+
+
+class PercentileIndex(PeriodicRefresh):
+    """
+    The current ScoreDistribution: Dataset.csv scored by the loaded model,
+    plus stored predictions from the same model version, re-read in the
+    background every `refresh_seconds` (0 never reads them).
+    """
+
+    def __init__(self, scores, cohorts, model_version, refresh_seconds=3600):
+        super().__init__(refresh_seconds)
+        self.reference = (np.asarray(scores, dtype=float), cohorts)
+        self.model_version = model_version
+        self.distribution = ScoreDistribution(scores, cohorts)
+
+    @classmethod
+    def from_reference_dataset(cls, backend, model_version, refresh_seconds=3600):
+        scores, cohorts = reference_scores(backend)
+        return cls(scores, cohorts, model_version, refresh_seconds)
+
+    def rank(self, scores, course=None, gender=None):
+        self.maybe_refresh()
+        return self.distribution.rank(scores, course=course, gender=gender)
+
+    def refresh(self):
+        scores, cohorts = stored_scores(self.model_version)
+        base_scores, base_cohorts = self.reference
+        self.distribution = ScoreDistribution(
+            np.vstack([base_scores, scores]),
+            {field: np.concatenate([base_cohorts[field], cohorts[field]]) for field in COHORT_FIELDS},
+        )
+        logger.info(f"Refreshed score percentiles with {len(scores)} stored predictions")
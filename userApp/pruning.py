@@ -0,0 +1,71 @@
+import copy
+
+import numpy as np
+from sklearn.ensemble import AdaBoostRegressor
+
+
+def tree_predictions(regressor, X):
+    """Each weak learner's predictions, shape (n_samples, n_estimators)"""
+    return np.array([tree.predict(X) for tree in regressor.estimators_]).T
+
+
+def weighted_median(predictions, weights):
+    """AdaBoostRegressor's weighted median over the columns of `predictions`"""
+    sorted_idx = np.argsort(predictions, axis=1)
+    weight_cdf = np.cumsum(weights[sorted_idx], axis=1)
+    median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, np.newaxis]
+    median_idx = median_or_above.argmax(axis=1)
+    rows = np.arange(predictions.shape[0])
+    return predictions[rows, sorted_idx[rows, median_idx]]
+
+
+def removal_order(regressor, X, y, strategy='greedy'):
+    """
+    Estimator indices in the order they should be pruned.
+
+    'weight' drops the lowest-weight learners first. 'greedy' repeatedly
+    drops whichever learner's removal hurts MAE on (X, y) least, which also
+    catches learners that are redundant with the rest of the ensemble.
+    """
+    weights = np.asarray(regressor.estimator_weights_[:len(regressor.estimators_)], dtype=float)
+    if strategy == 'weight':
+        return list(np.argsort(weights, kind='stable'))
+    if strategy != 'greedy':
+        raise ValueError(f"Unknown pruning strategy {strategy!r}")
+
+    predictions = tree_predictions(regressor, X)
+    remaining = list(range(len(weights)))
+    order = []
+    while len(remaining) > 1:
+        best, best_error = None, None
+        for candidate in remaining:
+            kept = [i for i in remaining if i != candidate]
+            error = np.abs(weighted_median(predictions[:, kept], weights[kept]) - y).mean()
+            if best_error is None or error < best_error:
+                best, best_error = candidate, error
+        remaining.remove(best)
+        order.append(best)
+    return order + remaining
+
+
+def prune_adaboost(regressor, keep):
+    """Copy of a fitted AdaBoostRegressor restricted to the `keep` estimator indices"""
+    if not isinstance(regressor, AdaBoostRegressor):
+        raise TypeError(f"Expected AdaBoostRegressor, got {type(regressor).__name__}")
+    keep = sorted(keep)
+    pruned = copy.copy(regressor)
+    pruned.estimators_ = [regressor.estimators_[i] for i in keep]
+    pruned.estimator_weights_ = np.asarray(regressor.estimator_weights_)[keep]
+    pruned.estimator_errors_ = np.asarray(regressor.estimator_errors_)[keep]
+    pruned.n_estimators = len(keep)
+    return pruned
+
+
+def prune_multioutput(model, orders, n_keep):
+    """Copy of a MultiOutput AdaBoost keeping the last `n_keep` learners of each removal order"""
+    pruned = copy.copy(model)
+    pruned.estimators_ = [
+        prune_adaboost(regressor, order[-n_keep:])
+        for regressor, order in zip(model.estimators_, orders)
+    ]
+    return pruned
@@ -0,0 +1,57 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class CostExceedsBurst(ValueError):
+    """A request costs more tokens than its bucket holds, so no wait would let it through"""
+
+    def __init__(self, cost, burst):
+        super().__init__(f"Request costs {cost} tokens, more than the limit of {burst}")
+        self.cost = cost
+        self.burst = burst
+
+
+def client_key(request):
+    """Authenticated users are limited by id, everyone else by client IP"""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded and settings.RATE_LIMIT_TRUST_X_FORWARDED_FOR:
+        return f'ip:{forwarded.split(",")[0].strip()}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def consume(key, rate, burst, cost=1):
+    """
+    Take `cost` tokens from the bucket stored under `key`, refilling at
+    `rate` tokens per second up to `burst`. Returns (allowed, retry_after
+    seconds), or raises CostExceedsBurst when `cost` can never be afforded.
+    The read and write are not atomic, so concurrent requests from one
+    client can occasionally both spend the same token.
+    """
+    if cost > burst:
+        raise CostExceedsBurst(cost, burst)
+    now = time.time()
+    tokens, updated = cache.get(key) or (burst, now)
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens < cost:
+        return False, math.ceil((cost - tokens) / rate)
+    # A bucket left alone until full is the same as no bucket, so let it expire
+    cache.set(key, (tokens - cost, now), timeout=math.ceil(burst / rate) + 1)
+    return True, 0
+
+
+def check_rate_limit(request, scope, cost=1):
+    """
+    Seconds to wait before retrying when `request` is over its `scope`
+    budget, else None. Raises CostExceedsBurst for a request larger than
+    the budget itself.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    rate, burst = settings.RATE_LIMITS[scope]
+    allowed, retry_after = consume(f'ratelimit:{scope}:{client_key(request)}', rate, burst, cost)
+    return None if allowed else retry_after
@@ -0,0 +1,75 @@
+import logging
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicRefresh:
+    """
+    Mixin for in-memory indexes rebuilt from the database in the background.
+
+    Call maybe_refresh() on each lookup: once `refresh_seconds` have passed
+    since the last rebuild, it runs the subclass's refresh() on a daemon
+    thread and returns immediately, so lookups keep using the old state
+    until refresh() swaps in the new one. refresh_seconds=0 never refreshes.
+    The first lookup always triggers a refresh.
+    """
+
+    refresh_seconds = 0
+
+    def __init__(self, refresh_seconds=0):
+        self.refresh_seconds = refresh_seconds
+        self._refreshed_at = float('-inf')
+        self._refreshing = threading.Lock()
+
+    def maybe_refresh(self):
+        if not self.refresh_seconds or time.monotonic() - self._refreshed_at <= self.refresh_seconds:
+            return
+        if self._refreshing.acquire(blocking=False):
+            self._refreshed_at = time.monotonic()
+            threading.Thread(
+                target=self._background_refresh, daemon=True, name=f'{type(self).__name__}-refresh',
+            ).start()
+
+    def refresh(self):
+        raise NotImplementedError
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"{type(self).__name__} refresh failed: {str(e)}")
+        finally:
+            # No request cycle closes this thread's database connection
+            connections.close_all()
+            self._refreshing.release()
+
+
+class LazyIndex:
+    """
+    An index built on first use instead of at import, so management commands
+    and tests that import the views never pay for it. Server processes build
+    it in the warm-up. A failed build is logged and leaves the feature off
+    (get() returns None) for the rest of the process.
+    """
+
+    def __init__(self, label, build):
+        self.label = label
+        self.build = build
+        self._lock = threading.Lock()
+        self._built = False
+        self._index = None
+
+    def get(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    try:
+                        self._index = self.build()
+                    except Exception as e:
+                        logger.warning(f"{self.label} disabled, could not build index: {str(e)}")
+                    self._built = True
+        return self._index
@@ -0,0 +1,106 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import AssessmentResult
+
+logger = logging.getLogger(__name__)
+
+
+def result_cache_key(result_id):
+    return f'result:{result_id}'
+
+
+def detached_cutoff():
+    """Results without a stored response that were created before this have expired"""
+    return timezone.now() - timedelta(seconds=settings.RESULT_CACHE_TTL)
+
+
+def store_result(context, user_response=None, owner=None):
+    """
+    Keep a result page's context under a new id and return the id.
+
+    Every result gets an AssessmentResult row, so any worker can render it.
+    Results of stored responses belong to the response's user. Anything else
+    is readable by `owner` (a user id) and staff, or by anyone holding the id
+    when there is no owner, as for anonymous visitors, and expires after
+    RESULT_CACHE_TTL seconds. When the database cannot take a detached
+    result, it is kept in this worker's cache only.
+    """
+    if user_response is not None:
+        owner = user_response.user_id
+    public = user_response is None and owner is None
+    try:
+        record = AssessmentResult.objects.create(
+            user_response=user_response,
+            owner_id=owner if user_response is None else None,
+            public=public,
+            context=context,
+        )
+        result_id, created_at = record.id, record.created_at
+    except DatabaseError as e:
+        if user_response is not None:
+            raise
+        logger.error(f"Could not store result, keeping it in the cache only: {str(e)}")
+        result_id, created_at = uuid.uuid4(), timezone.now()
+    cache.set(result_cache_key(result_id), {
+        'context': context,
+        'created_at': created_at,
+        'owner': owner,
+        'public': public,
+    }, settings.RESULT_CACHE_TTL)
+    return result_id
+
+
+def find_result(user, submission_key):
+    """Id of the stored result of `user`'s submission with this key, or None"""
+    return (
+        AssessmentResult.objects
+        .filter(user_response__user=user, user_response__submission_key=submission_key)
+        .values_list('pk', flat=True)
+        .first()
+    )
+
+
+def load_result(result_id):
+    """The cached entry for `result_id`, read through from the database, or None"""
+    entry = cache.get(result_cache_key(result_id))
+    if entry is not None:
+        return entry
+    record = (
+        AssessmentResult.objects
+        .select_related('user_response')
+        .filter(pk=result_id)
+        .first()
+    )
+    if record is None:
+        return None
+    timeout = settings.RESULT_CACHE_TTL
+    if record.user_response is None:
+        timeout = (record.created_at - detached_cutoff()).total_seconds()
+        # Not purged yet, but past its lifetime all the same
+        if timeout <= 0:
+            return None
+        owner = record.owner_id
+    else:
+        # Anonymized responses have no owner, so only staff can open them
+        owner = record.user_response.user_id
+    entry = {
+        'context': record.context,
+        'created_at': record.created_at,
+        'owner': owner,
+        'public': record.public,
+    }
+    cache.set(result_cache_key(result_id), entry, timeout)
+    return entry
+
+
+def can_view(request, entry):
+    if entry['public'] or request.user.is_staff:
+        return True
+    return entry['owner'] is not None and entry['owner'] == request.user.pk
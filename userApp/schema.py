@@ -0,0 +1,104 @@
+import math
+
+from django import forms
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+from .forms import MentalHealthForm
+
+REQUIRED = "This field is required."
+NOT_A_NUMBER = "Enter a number."
+NOT_AN_INTEGER = "Enter a whole number."
+NOT_AN_OBJECT = "Expected a JSON object."
+
+
+def _choice_validator(field):
+    allowed = frozenset(value for value, _ in field.choices if value != '')
+
+    def validate(value):
+        if isinstance(value, str) and value in allowed:
+            return value, None
+        return None, f"Select a valid choice. {value} is not one of the available choices."
+
+    return validate
+
+
+def _number_validator(field):
+    # DecimalField and FloatField subclass IntegerField
+    integer = not isinstance(field, (forms.DecimalField, forms.FloatField))
+    low = max((v.limit_value for v in field.validators if isinstance(v, MinValueValidator)), default=None)
+    high = min((v.limit_value for v in field.validators if isinstance(v, MaxValueValidator)), default=None)
+
+    def validate(value):
+        # bool is an int subclass, but true/false is never a valid answer
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return None, NOT_A_NUMBER
+        try:
+            number = float(value)
+        except (TypeError, ValueError, OverflowError):
+            return None, NOT_A_NUMBER
+        if not math.isfinite(number):
+            return None, NOT_A_NUMBER
+        if integer and not number.is_integer():
+            return None, NOT_AN_INTEGER
+        if low is not None and number < low:
+            return None, f"Ensure this value is greater than or equal to {low}."
+        if high is not None and number > high:
+            return None, f"Ensure this value is less than or equal to {high}."
+        return number, None
+
+    return validate
+
+
+def compile_field(field):
+    if isinstance(field, forms.ChoiceField):
+        return _choice_validator(field)
+    if isinstance(field, forms.IntegerField):
+        return _number_validator(field)
+    raise TypeError(f"No JSON validator for {type(field).__name__}")
+
+
+class InputSchema:
+    """
+    JSON payload validation compiled once from a form's fields.
+
+    Choices and min/max validators are read off the form so the API and the
+    HTML form accept the same answers, but each field is checked by a plain
+    closure instead of a bound form, and numbers come back as floats ready
+    for encoding. Decimal places are not enforced on JSON numbers.
+    """
+
+    def __init__(self, form_class):
+        self.fields = [
+            (name, field.required, compile_field(field))
+            for name, field in form_class.base_fields.items()
+        ]
+        self.validators = {name: validate for name, _, validate in self.fields}
+
+    def validate(self, data):
+        """(cleaned, errors) for one payload; errors maps field name to message"""
+        if not isinstance(data, dict):
+            return None, {'__all__': NOT_AN_OBJECT}
+        cleaned, errors = {}, {}
+        for name, required, validate in self.fields:
+            value = data.get(name)
+            if value is None or value == '':
+                if required:
+                    errors[name] = REQUIRED
+                continue
+            cleaned[name], error = validate(value)
+            if error:
+                errors[name] = error
+        return cleaned, errors
+
+    def validate_many(self, rows):
+        """(cleaned rows, errors) for a batch; errors maps row index to that row's errors"""
+        cleaned_rows, errors = [], {}
+        for i, row in enumerate(rows):
+            cleaned, row_errors = self.validate(row)
+            if row_errors:
+                errors[i] = row_errors
+            cleaned_rows.append(cleaned)
+        return cleaned_rows, errors
+
+
+prediction_schema = InputSchema(MentalHealthForm)
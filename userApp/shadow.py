@@ -0,0 +1,131 @@
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+from .batching import Histogram
+from .insights import TARGET_KEYS, insight_level
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowEvaluator:
+    """
+    Score a sample of live submissions with a candidate model off the
+    request path and compare it against the served model.
+
+    submit() never blocks: sampled rows go onto a bounded queue and are
+    dropped when it is full. A background thread scores them with the
+    candidate; the served model's latency is the one measured on the
+    request path. Only running aggregates are kept: per-output score delta
+    mean/std, absolute-delta histogram, how often the Low/Moderate/High
+    level agrees, and per-call latency histograms.
+    """
+
+    ABS_DELTA_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1, 2)
+    LATENCY_MS_BOUNDS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+    def __init__(self, candidate, candidate_version, sample_rate=0.1, queue_size=256):
+        self.candidate = candidate
+        self.candidate_version = candidate_version
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self.abs_delta = {key: Histogram(self.ABS_DELTA_BOUNDS) for key in TARGET_KEYS}
+        self.primary_ms = Histogram(self.LATENCY_MS_BOUNDS)
+        self.candidate_ms = Histogram(self.LATENCY_MS_BOUNDS)
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._worker_pid = None
+        self._counts = {'sampled': 0, 'dropped': 0, 'rows': 0, 'errors': 0}
+        self._mean = np.zeros(len(TARGET_KEYS))
+        self._m2 = np.zeros(len(TARGET_KEYS))
+        self._agree = np.zeros(len(TARGET_KEYS), dtype=int)
+
+    def submit(self, encoded, prediction, primary_ms):
+        """
+        Queue encoded, unscaled rows and the scores served for them, if
+        sampled. `primary_ms` is how long serving them took.
+        """
+        if random.random() >= self.sample_rate:
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((np.array(encoded, dtype=float), np.array(prediction, dtype=float), primary_ms))
+            self._count('sampled')
+        except queue.Full:
+            self._count('dropped')
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            rows = counts['rows']
+            mean, m2, agree = self._mean.copy(), self._m2.copy(), self._agree.copy()
+        std = np.sqrt(m2 / rows) if rows else np.zeros_like(mean)
+        return {
+            'candidate_version': self.candidate_version,
+            'sample_rate': self.sample_rate,
+            'pending': self._queue.qsize(),
+            **counts,
+            'outputs': {
+                key: {
+                    'mean_delta': float(mean[i]),
+                    'std_delta': float(std[i]),
+                    'level_agreement': float(agree[i] / rows) if rows else None,
+                    'abs_delta': self.abs_delta[key].snapshot(),
+                }
+                for i, key in enumerate(TARGET_KEYS)
+            },
+            'primary_ms': self.primary_ms.snapshot(),
+            'candidate_ms': self.candidate_ms.snapshot(),
+        }
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def _ensure_worker(self):
+        # gunicorn forks after import, so the thread must be started per process
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue(self.queue_size)
+                threading.Thread(target=self._run, name='shadow-evaluator', daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def _run(self):
+        while True:
+            encoded, served, primary_ms = self._queue.get()
+            try:
+                self._score(encoded, served, primary_ms)
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"Shadow scoring failed: {str(e)}")
+
+    def _score(self, encoded, served, primary_ms):
+        started = time.perf_counter()
+        candidate_scores = self.candidate.predict(self.candidate.transform(encoded))
+        self.candidate_ms.observe((time.perf_counter() - started) * 1000.0)
+        self.primary_ms.observe(primary_ms)
+
+        deltas = candidate_scores - served
+        agree = np.array([
+            [insight_level(key, c) == insight_level(key, s) for key, c, s in zip(TARGET_KEYS, c_row, s_row)]
+            for c_row, s_row in zip(candidate_scores.tolist(), served.tolist())
+        ])
+        for i, key in enumerate(TARGET_KEYS):
+            for delta in np.abs(deltas[:, i]).tolist():
+                self.abs_delta[key].observe(delta)
+
+        with self._lock:
+            # Welford's online update, one row at a time
+            for row in deltas:
+                self._counts['rows'] += 1
+                step = row - self._mean
+                self._mean += step / self._counts['rows']
+                self._m2 += step * (row - self._mean)
+            self._agree += agree.sum(axis=0)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import AssessmentResult
+from .results import result_cache_key
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Apply the SQLite performance profile to every new connection"""
+    if connection.vendor != 'sqlite' or not settings.SQLITE_TUNING:
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@receiver(post_delete, sender=AssessmentResult)
+def forget_deleted_result(sender, instance, **kwargs):
+    """Deleted results (e.g. purged with their response) must stop rendering from the cache"""
+    # The key is taken now: the deletion resets instance.pk before the commit
+    key = result_cache_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
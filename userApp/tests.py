@@ -1,3 +1,523 @@
-from django.test import TestCase
+import importlib
+import json
+import os
+import random
+import runpy
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.http import JsonResponse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+import numpy as np
+import pandas as pd
+
+from . import views
+from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS, encode
+from .idempotency import SUBMISSION_TOKEN_FIELD
+from .insights import build_explanations, build_insights, encode_prediction_response
+from .ml import MODEL_VERSION, manual_encode
+from .models import AssessmentResult, Prediction, UserResponse
+from .results import load_result, store_result
+from .schema import NOT_A_NUMBER, NOT_AN_INTEGER, NOT_AN_OBJECT, REQUIRED, prediction_schema
+
+SETTINGS_PATH = os.path.join(settings.BASE_DIR, 'Student_Mental_Health', 'settings.py')
+
+ANSWERS = {
+    'age': 21, 'gender': 'Male', 'course': 'Engineering', 'cgpa': 3.2, 'semester_credit_load': 20,
+    'sleep_quality': 'Poor', 'physical_activity': 'Low', 'diet_quality': 'Average', 'social_support': 'Low',
+    'relationship_status': 'Single', 'financial_stress': 4, 'substance_use': 'Never',
+    'counseling_service_use': 'Never', 'extracurricular_involvement': 'Low', 'residence_type': 'On-Campus',
+    'family_history': 'No', 'chronic_illness': 'No',
+}
+
+
+def load_settings(**env):
+    """The settings module's globals as evaluated under the given environment"""
+    with mock.patch.dict(os.environ, env):
+        return runpy.run_path(SETTINGS_PATH)
+
+
+class DatabaseSettingsTests(TestCase):
+    POSTGRES_URL = 'postgres://mm:secret@db:5432/mindmetrics'
+
+    def test_persistent_connections_by_default(self):
+        database = load_settings(DATABASE_URL=self.POSTGRES_URL)['DATABASES']['default']
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 600)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+
+    def test_pool_turns_off_persistent_connections(self):
+        database = load_settings(
+            DATABASE_URL=self.POSTGRES_URL, DB_POOL='True', DB_POOL_MAX_SIZE='4',
+        )['DATABASES']['default']
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 4, 'timeout': 10})
+
+    def test_pgbouncer_disables_server_side_cursors(self):
+        database = load_settings(DATABASE_URL=self.POSTGRES_URL, DB_PGBOUNCER='True')['DATABASES']['default']
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+
+class SqliteTuningTests(TestCase):
+    def pragmas(self):
+        """synchronous and cache_size as seen by a freshly opened connection"""
+        connection = connections.create_connection('default')
+        try:
+            with connection.cursor() as cursor:
+                return {
+                    pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                    for pragma in ('synchronous', 'cache_size')
+                }
+        finally:
+            connection.close()
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self.pragmas(), {
+            'synchronous': 1,  # NORMAL
+            'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+        })
+
+    @override_settings(SQLITE_TUNING=False)
+    def test_sqlite_defaults_without_tuning(self):
+        self.assertEqual(self.pragmas()['synchronous'], 2)  # FULL
+
+    def test_tuning_takes_the_write_lock_at_begin(self):
+        database = load_settings(DATABASE_URL='sqlite:////tmp/tuned.sqlite3', SQLITE_TUNING='True')['DATABASES']
+        self.assertEqual(database['default']['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+
+class PredictionSchemaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def errors(self, **changes):
+        return prediction_schema.validate({**ANSWERS, **changes})[1]
+
+    def test_valid_answers(self):
+        cleaned, errors = prediction_schema.validate(ANSWERS)
+        self.assertEqual(errors, {})
+        self.assertEqual(cleaned['age'], 21.0)
+
+    def test_field_errors(self):
+        self.assertEqual(self.errors(age=None), {'age': REQUIRED})
+        self.assertEqual(self.errors(age='twenty'), {'age': NOT_A_NUMBER})
+        self.assertEqual(self.errors(age=True), {'age': NOT_A_NUMBER})
+        self.assertEqual(self.errors(age=float('nan')), {'age': NOT_A_NUMBER})
+        self.assertEqual(self.errors(age=10 ** 400), {'age': NOT_A_NUMBER})
+        self.assertEqual(self.errors(age=20.5), {'age': NOT_AN_INTEGER})
+        self.assertEqual(self.errors(age=5), {'age': "Ensure this value is greater than or equal to 10."})
+        self.assertIn('gender', self.errors(gender='Unknown'))
+        self.assertEqual(prediction_schema.validate([]), (None, {'__all__': NOT_AN_OBJECT}))
+
+    def test_api_returns_field_errors(self):
+        response = self.client.post(
+            '/predict/', json.dumps({**ANSWERS, 'age': 'twenty', 'gender': None}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], {'age': NOT_A_NUMBER, 'gender': REQUIRED})
+
+    def test_batch_errors_are_keyed_by_row(self):
+        response = self.client.post(
+            '/predict/', json.dumps([ANSWERS, {**ANSWERS, 'cgpa': 9}]), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()['errors']), ['1'])
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'single': (0.5, 2), 'batch': (1, 5)})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def predict(self, payload, **extra):
+        return self.client.post('/predict/', json.dumps(payload), content_type='application/json', **extra)
+
+    def test_over_budget_gets_429_with_retry_after(self):
+        self.assertEqual(self.predict(ANSWERS).status_code, 200)
+        self.assertEqual(self.predict(ANSWERS).status_code, 200)
+        response = self.predict(ANSWERS)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '2')
+
+    def test_clients_have_separate_budgets(self):
+        for _ in range(2):
+            self.predict(ANSWERS)
+        self.assertEqual(self.predict(ANSWERS).status_code, 429)
+        self.assertEqual(self.predict(ANSWERS, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_batch_rows_spend_batch_tokens(self):
+        self.assertEqual(self.predict([ANSWERS] * 3).status_code, 200)
+        response = self.predict([ANSWERS] * 3)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_batch_larger_than_burst_is_rejected_outright(self):
+        response = self.predict([ANSWERS] * 6)
+        self.assertEqual(response.status_code, 413)
+        self.assertNotIn('Retry-After', response)
+
+    def test_invalid_form_does_not_spend_a_token(self):
+        for _ in range(3):
+            response = self.client.post('/', {**ANSWERS, 'age': 5})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['form'].errors)
+        self.assertEqual(self.client.post('/', ANSWERS).status_code, 302)
+        self.assertEqual(self.client.post('/', ANSWERS).status_code, 302)
+        self.assertEqual(self.client.post('/', ANSWERS).status_code, 429)
+
+
+@override_settings(IDEMPOTENCY_ENABLED=True, RATE_LIMIT_ENABLED=False)
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        scorer = mock.patch.object(views, 'predict_response', wraps=views.predict_response)
+        self.predict_response = scorer.start()
+        self.addCleanup(scorer.stop)
+
+    def predict(self, payload, key='retry-key-0001'):
+        return self.client.post(
+            '/predict/', json.dumps(payload), content_type='application/json', HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def submit(self, token='form-token-0001', **changes):
+        return self.client.post('/', {**ANSWERS, **changes, SUBMISSION_TOKEN_FIELD: token})
+
+    def test_retry_replays_first_response(self):
+        first = self.predict(ANSWERS)
+        retry = self.predict(ANSWERS)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.content, first.content)
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(self.predict_response.call_count, 1)
+
+    def test_same_key_with_changed_body_is_scored_again(self):
+        self.predict(ANSWERS)
+        response = self.predict({**ANSWERS, 'sleep_quality': 'Good'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(self.predict_response.call_count, 2)
+
+    def test_failed_request_releases_key(self):
+        payload = {**ANSWERS, 'age': 'twenty'}
+        self.assertEqual(self.predict(payload).status_code, 400)
+        # A kept claim would make the retry wait for it and then answer 409
+        retry = self.predict(payload)
+        self.assertEqual(retry.status_code, 400)
+        self.assertNotIn('Idempotent-Replayed', retry)
+
+    def test_invalid_form_releases_token(self):
+        self.assertEqual(self.submit(age=5).status_code, 200)
+        self.assertEqual(self.submit(age=5).status_code, 200)
+
+    def test_rate_limited_form_releases_token(self):
+        with self.settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'single': (0.5, 1), 'batch': (1, 5)}):
+            self.assertEqual(self.submit(token='form-token-0001').status_code, 302)
+            self.assertEqual(self.submit(token='form-token-0002', age=30).status_code, 429)
+        self.assertEqual(self.submit(token='form-token-0002', age=30).status_code, 302)
+
+    def test_resubmitted_form_redirects_to_first_result(self):
+        self.client.force_login(User.objects.create_user('student', password='unused-password'))
+        first = self.submit()
+        self.assertEqual(self.submit()['Location'], first['Location'])
+        self.assertEqual(UserResponse.objects.count(), 1)
+
+    def test_duplicate_stored_by_another_worker_shows_its_result(self):
+        self.client.force_login(User.objects.create_user('student', password='unused-password'))
+        first = self.submit()
+        # Another worker with its own cache: the claim succeeds, the unique constraint does not
+        cache.clear()
+        self.assertEqual(self.submit()['Location'], first['Location'])
+        self.assertEqual(UserResponse.objects.count(), 1)
+        self.assertEqual(AssessmentResult.objects.count(), 1)
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class ResultPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user('student', password='unused-password')
+
+    def submit(self, client=None):
+        client = client or self.client
+        response = client.post('/', {**ANSWERS, SUBMISSION_TOKEN_FIELD: 'form-token-0001'})
+        self.assertEqual(response.status_code, 302)
+        self.assertRegex(response['Location'], r'^/result/[0-9a-f-]{36}/$')
+        return response['Location']
+
+    def viewer(self, user=None):
+        client = self.client_class()
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def test_submission_redirects_to_result_page(self):
+        url = self.submit()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'result.html')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_anonymous_result_opens_from_link(self):
+        url = self.submit()
+        self.assertEqual(self.viewer().get(url).status_code, 200)
+
+    def test_only_owner_and_staff_see_stored_result(self):
+        self.client.force_login(self.student)
+        url = self.submit()
+        staff = User.objects.create_user('staff', password='unused-password', is_staff=True)
+        other = User.objects.create_user('other', password='unused-password')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.viewer(staff).get(url).status_code, 200)
+        self.assertEqual(self.viewer(other).get(url).status_code, 404)
+        self.assertEqual(self.viewer().get(url).status_code, 404)
+
+    def test_stored_result_survives_cache_loss(self):
+        self.client.force_login(self.student)
+        url = self.submit()
+        cache.clear()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.viewer().get(url).status_code, 404)
+
+    def test_anonymous_result_opens_on_another_worker(self):
+        url = self.submit()
+        # The GET after the redirect may reach a worker whose cache never saw the POST
+        cache.clear()
+        self.assertEqual(self.viewer().get(url).status_code, 200)
+
+    def test_unsaved_response_result_stays_with_its_owner(self):
+        self.client.force_login(self.student)
+        with mock.patch.object(views.UserResponse, 'from_form_data', side_effect=ValueError("save failed")):
+            url = self.submit()
+        self.assertFalse(UserResponse.objects.exists())
+        cache.clear()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.viewer().get(url).status_code, 404)
+
+    def test_anonymous_result_expires_and_is_purged(self):
+        url = self.submit()
+        AssessmentResult.objects.update(created_at=timezone.now() - timedelta(seconds=settings.RESULT_CACHE_TTL + 1))
+        cache.clear()
+        self.assertEqual(self.viewer().get(url).status_code, 404)
+        call_command('purge_responses', days=365, stdout=StringIO())
+        self.assertFalse(AssessmentResult.objects.exists())
+
+    def test_revalidation_gets_304(self):
+        url = self.submit()
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_deleted_response_takes_its_result_with_it(self):
+        self.client.force_login(self.student)
+        url = self.submit()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserResponse.objects.all().delete()
+        self.assertFalse(AssessmentResult.objects.exists())
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class RescorePredictionsTests(TestCase):
+    def setUp(self):
+        self.responses = [UserResponse.from_form_data(ANSWERS) for _ in range(5)]
+        for response in self.responses:
+            response.save()
+
+    def rescore(self, **options):
+        out = StringIO()
+        call_command('rescore_predictions', stdout=out, **options)
+        return out.getvalue()
+
+    def scored_ids(self):
+        return set(Prediction.objects.filter(model_version=MODEL_VERSION).values_list('user_response_id', flat=True))
+
+    def test_scores_every_response_once(self):
+        output = self.rescore(chunk_size=2)
+        self.assertIn("Done: 5 responses scored", output)
+        self.assertEqual(self.scored_ids(), {response.pk for response in self.responses})
+        self.assertIn("Done: 0 responses scored", self.rescore(chunk_size=2))
+        self.assertEqual(Prediction.objects.count(), 5)
+
+    def test_limit_caps_the_last_chunk(self):
+        self.rescore(chunk_size=2, workers=2, limit=3)
+        self.assertEqual(self.scored_ids(), {response.pk for response in self.responses[:3]})
+
+    def test_resumes_after_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'rescore.json')
+            with open(checkpoint, 'w') as f:
+                json.dump({'model_version': MODEL_VERSION, 'last_id': self.responses[1].pk}, f)
+            self.rescore(chunk_size=2, checkpoint=checkpoint)
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)['last_id'], self.responses[-1].pk)
+        self.assertEqual(self.scored_ids(), {response.pk for response in self.responses[2:]})
+
+    def test_checkpoint_of_another_version_starts_over(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'rescore.json')
+            with open(checkpoint, 'w') as f:
+                json.dump({'model_version': 'older', 'last_id': self.responses[-1].pk}, f)
+            self.rescore(checkpoint=checkpoint)
+        self.assertEqual(len(self.scored_ids()), 5)
+
+    def test_legacy_rows_skipped_unless_imputed(self):
+        # Responses saved before the course question was stored
+        legacy = {response.pk for response in self.responses[:2]}
+        UserResponse.objects.filter(pk__in=legacy).update(course=None)
+
+        self.assertIn("3 responses scored (0 with imputed answers), 2 skipped", self.rescore())
+        self.assertFalse(self.scored_ids() & legacy)
+
+        self.assertIn("2 responses scored (2 with imputed answers), 0 skipped", self.rescore(impute_missing=True))
+        imputed = Prediction.objects.filter(model_version=MODEL_VERSION, imputed=True)
+        self.assertEqual(set(imputed.values_list('user_response_id', flat=True)), legacy)
+
+
+@override_settings(FAST_JSON=False)
+class PredictionEncodingTests(TestCase):
+    """The pre-encoded payload must stay byte-identical to the JsonResponse it replaced"""
+
+    def expected(self, prediction, **extra):
+        return JsonResponse({
+            'status': 'success',
+            'prediction': prediction.tolist(),
+            'insights': build_insights(prediction[0]),
+            'explanation': {'explanations': build_explanations(prediction[0])},
+            **extra,
+        }).content
+
+    def assertEncodedLikeJsonResponse(self, scores, **extra):
+        prediction = np.array([scores], dtype=float)
+        self.assertEqual(encode_prediction_response(prediction, **extra), self.expected(prediction, **extra))
+
+    def test_band_edges(self):
+        edges = [0.0, 1.9999999, 2, 2.0000001, 3.4999999, 3.5, 3.9999999, 4, 5, -0.1]
+        for score in edges:
+            self.assertEncodedLikeJsonResponse([score, edges[-1 - edges.index(score)], score])
+
+    def test_random_scores(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            self.assertEncodedLikeJsonResponse([rng.uniform(-1, 6) for _ in range(3)])
+
+    def test_extras(self):
+        self.assertEncodedLikeJsonResponse(
+            [2.5, 3.75, 1.25],
+            contributions={'stress': [{'feature': 'Sleep_Quality', 'answer': 'Poor', 'value': 0.31}]},
+            percentiles={'overall': {'stress': 61.5}, 'cohort': None},
+            similar={'count': 25, 'mean': [2.1, 3.0, 2.7]},
+        )
+
+    def test_non_ascii(self):
+        self.assertEncodedLikeJsonResponse(
+            [1.0, 2.0, 3.0], contributions=[{'feature': 'Café', 'answer': 'Naïve “quoted” ✓ 学生'}],
+        )
+
+
+class PurgeResponsesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user('student', password='unused-password')
+        long_ago = timezone.now() - timedelta(days=400)
+        self.old = [self.response(self.student, long_ago) for _ in range(3)]
+        self.old_anonymous = self.response(None, long_ago)
+        self.recent = self.response(self.student, timezone.now())
+
+    def response(self, user, submitted_at):
+        response = UserResponse.from_form_data(ANSWERS, user=user)
+        response.submitted_at = submitted_at
+        response.save()
+        Prediction.objects.create(
+            user_response=response, stress_level=2.5, depression_score=3.1, anxiety_score=1.8,
+            model_version=MODEL_VERSION,
+        )
+        store_result({'prediction': [[2.5, 3.1, 1.8]]}, response)
+        return response
+
+    def purge(self, **options):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('purge_responses', stdout=out, **{'days': 365, 'batch_size': 2, **options})
+        return out.getvalue()
+
+    def test_delete_removes_only_expired_responses_and_their_records(self):
+        old_results = list(AssessmentResult.objects.filter(user_response__in=self.old).values_list('pk', flat=True))
+        output = self.purge(mode='delete')
+        self.assertIn("Deleted 4 responses and 4 predictions", output)
+        self.assertEqual(list(UserResponse.objects.all()), [self.recent])
+        self.assertEqual(list(Prediction.objects.values_list('user_response', flat=True)), [self.recent.pk])
+        self.assertEqual(list(AssessmentResult.objects.values_list('user_response', flat=True)), [self.recent.pk])
+        # Their cached pages go too
+        self.assertTrue(all(load_result(pk) is None for pk in old_results))
+
+    def test_dry_run_changes_nothing(self):
+        output = self.purge(mode='delete', dry_run=True)
+        self.assertIn("Would delete 4 responses", output)
+        self.assertEqual(UserResponse.objects.count(), 5)
+        self.assertEqual(Prediction.objects.count(), 5)
+        self.assertEqual(AssessmentResult.objects.count(), 5)
+
+    def test_anonymize_unlinks_users_and_keeps_predictions(self):
+        result_id = AssessmentResult.objects.get(user_response=self.old[0]).pk
+        output = self.purge(mode='anonymize')
+        self.assertIn("Anonymized 3 responses", output)
+        self.assertEqual(UserResponse.objects.filter(user__isnull=True).count(), 4)
+        self.assertEqual(UserResponse.objects.get(pk=self.recent.pk).user, self.student)
+        self.assertEqual(Prediction.objects.count(), 5)
+        self.assertEqual(AssessmentResult.objects.count(), 5)
+        # The former owner can no longer open the result, only staff can
+        self.assertIsNone(load_result(result_id)['owner'])
+
+    def test_nothing_to_purge(self):
+        self.assertIn("No responses submitted before", self.purge(mode='delete', days=1000))
+        self.assertEqual(UserResponse.objects.count(), 5)
+
+
+class AnswerEncodingTests(TestCase):
+    """Stored codes, the API's manual_encode and the 0006 data migration must agree"""
+
+    def test_choices_match_the_frozen_migration_codes(self):
+        codes = importlib.import_module('userApp.migrations.0006_encode_userresponse_choices').CODES
+        for field, choices in CATEGORICAL_FIELDS.items():
+            if field == 'course':
+                continue  # added by 0006, never stored as labels
+            self.assertEqual(codes[field], {label: value for value, label in choices.choices}, field)
+
+    def test_every_label_encodes_to_its_code(self):
+        for feature, field in FEATURE_FIELDS.items():
+            choices = CATEGORICAL_FIELDS.get(field)
+            if choices is None:
+                continue
+            labels = [label for _, label in choices.choices]
+            frame = pd.DataFrame({name: [ANSWERS[other]] * len(labels) for name, other in FEATURE_FIELDS.items()})
+            frame[feature] = labels
+            self.assertEqual(manual_encode(frame)[feature].tolist(), [value for value, _ in choices.choices])
+            for value, label in choices.choices:
+                self.assertEqual(encode(choices, label), value)
+        self.assertIsNone(encode(CATEGORICAL_FIELDS['gender'], 'Unknown'))
+
+    def test_stored_row_matches_the_api_encoding(self):
+        for changes in ({}, {'relationship_status': 'In a relationship', 'residence_type': 'With Family',
+                             'substance_use': 'Occasionally', 'gender': 'Female', 'course': 'Law'}):
+            answers = {**ANSWERS, **changes}
+            response = UserResponse.from_form_data(answers)
+            response.save()
+            response.refresh_from_db()
+            self.assertEqual(response.feature_row(), views.encode_rows([dict(answers)])[0].tolist())
+
+    def test_missing_answer_is_nan(self):
+        response = UserResponse.from_form_data({**ANSWERS, 'course': None})
+        self.assertTrue(np.isnan(response.feature_row()[list(FEATURE_FIELDS.values()).index('course')]))
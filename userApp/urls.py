@@ -8,7 +8,16 @@ from django.contrib.auth import views as auth_views
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('result/<uuid:result_id>/', views.result_view, name='result'),
     path('predict/', views.predict_api, name='predict_api'),
+    path('predict/whatif/', views.what_if_api, name='what_if_api'),
+    path('healthz', views.healthz, name='healthz'),
+    path('readyz', views.readyz, name='readyz'),
+    path('metrics/inference/', views.inference_metrics, name='inference_metrics'),
+    path('metrics/drift/', views.drift_metrics, name='drift_metrics'),
+    path('metrics/shadow/', views.shadow_metrics, name='shadow_metrics'),
+    path('metrics/similar/', views.similar_profiles_metrics, name='similar_profiles_metrics'),
+    path('metrics/profiles/<str:profile_id>/', views.profile_report, name='profile_report'),
     path('blog/', views.blog.as_view(), name='blog'),
     path('contact/', views.contact, name='contact'),
     path('about/', views.about.as_view(), name='about'),
@@ -1,9 +1,8 @@
-import joblib
+import hashlib
 import json
-import os
-import numpy as np
 import pandas as pd
 import logging
+import time
 from django.shortcuts import render, redirect
 from django.http import JsonResponse, HttpResponse
 from .forms import MentalHealthForm, UserRegistrationForm
@@ -11,6 +10,7 @@ from django.conf import settings
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import authenticate
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib import messages
@@ -18,86 +18,116 @@ from .models import Profile
 from django.contrib.auth.forms import PasswordChangeForm
 from .forms import ProfileForm, UserUpdateForm,ContactForm
 from .models import UserResponse, Prediction
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from django.views import View
+from django.db import IntegrityError, transaction
+from .backends import get_backend
+from .batching import MicroBatcher
+from .choices import Course, Gender, encode
+from .drift import DriftMonitor
+from .idempotency import (
+    IDEMPOTENCY_HEADER, SUBMISSION_TOKEN_FIELD, claim, form_fingerprint, new_submission_token,
+)
+from .middleware import profile_cache_key
+from .insights import TARGET_KEYS, build_explanations, build_insights, encode_prediction_response
+from .neighbors import SimilarProfiles
+from .percentiles import PercentileIndex
+from .ratelimit import CostExceedsBurst, check_rate_limit
+from .refresh import LazyIndex
+from .results import can_view, find_result, load_result, store_result
+from .schema import prediction_schema
+from .shadow import ShadowEvaluator
+from . import warmup
+from .whatif import expand_grid, grid_size, parse_vary, variant_matrix
+from .ml import (
+    MODEL_VERSION, artifact_version, backend, clean_numeric_input, expected_features, explainer, feature_selector,
+    manual_encode, model, scaler, transform_features,
+)
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Define the expected features in the exact order your model expects them
-expected_features = [
-    'Age', 'Course', 'Gender', 'CGPA', 'Sleep_Quality', 'Social_Support',
-    'Relationship_Status', 'Substance_Use', 'Counseling_Service_Use',
-    'Semester_Credit_Load', 'Family_History', 'Chronic_Illness',
-    'Extracurricular_Involvement', 'Residence_Type', 'Physical_Activity',
-    'Diet_Quality', 'Financial_Stress'
-]
-
-# Load all required models and preprocessing objects
-model_dir = os.path.join(settings.BASE_DIR, 'userApp', 'Ml_models')
-
-try:
-    ada_model = joblib.load(os.path.join(model_dir, 'multioutput_adaboost_model.joblib'))
-    feature_selector = joblib.load(os.path.join(model_dir, 'feature_selector_Ada.joblib'))
-    scaler = joblib.load(os.path.join(model_dir, 'scaler_Ada.joblib'))
-except Exception as e:
-    logger.error(f"Failed to load ML models: {str(e)}")
-    raise ImportError(f"Failed to load ML models: {str(e)}")
-
-def clean_numeric_input(value):
-    """Clean and convert numeric input to float"""
-    if value is None:
-        return 0.0
-    if isinstance(value, str):
-        # Remove any non-numeric characters except decimal point and minus
-        value = ''.join(c for c in value if c.isdigit() or c in {'.', '-'})
-        if not value:  # Handle empty string after cleaning
-            return 0.0
+# Concurrent single-row requests share one vectorized predict when batching is on
+if settings.INFERENCE_BATCHING:
+    inference_model = MicroBatcher(
+        model,
+        window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+        max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+        timeout_ms=settings.INFERENCE_BATCH_TIMEOUT_MS,
+    )
+else:
+    inference_model = model
+
+
+def predictor(request):
+    # Profiled requests skip the micro-batcher so the model shows up in their profile
+    if getattr(request, 'profiling', False):
+        return model
+    return inference_model
+
+# Live submissions are compared against Dataset.csv, bin counts only
+drift_monitor = None
+if settings.DRIFT_MONITORING:
     try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0  # Default value if conversion fails
-
-def manual_encode(df):
-    gender_map = {'Male': 0, 'Female': 1, 'Others': 2}
-    sleep_quality_map = {'Good': 0, 'Average': 1, 'Poor': 2}
-    social_support_map = {'Low': 0, 'Moderate': 1, 'High': 2}
-    relationship_map = {'Single': 0, 'In a relationship': 1, 'Married': 2}
-    substance_use_map = {'Never': 0, 'Occasionally': 1, 'Frequently': 2}
-    counseling_map = {'Never': 0, 'Occasionally': 1, 'Frequently': 2}
-    course_map = {
-        'Engineering': 0, 'Business': 1, 'Computer': 2,
-        'Law': 3, 'Medical': 4, 'Other': 5
-    }
-    activity_map = {'Low': 0, 'Moderate': 1, 'High': 2}
-    diet_map = {'Good': 0, 'Average': 1, 'Poor': 2}
-    residence_map = {'On-Campus': 0, 'Off-Campus': 1, 'With Family': 2}
-    binary_map = {'Yes': 1, 'No': 0}
-
-    df['Gender'] = df['Gender'].map(gender_map)
-    df['Sleep_Quality'] = df['Sleep_Quality'].map(sleep_quality_map)
-    df['Social_Support'] = df['Social_Support'].map(social_support_map)
-    df['Relationship_Status'] = df['Relationship_Status'].map(relationship_map)
-    df['Substance_Use'] = df['Substance_Use'].map(substance_use_map)
-    df['Counseling_Service_Use'] = df['Counseling_Service_Use'].map(counseling_map)
-    df['Course'] = df['Course'].map(course_map)
-    df['Extracurricular_Involvement'] = df['Extracurricular_Involvement'].map(activity_map)
-    df['Residence_Type'] = df['Residence_Type'].map(residence_map)
-    df['Physical_Activity'] = df['Physical_Activity'].map(activity_map)
-    df['Diet_Quality'] = df['Diet_Quality'].map(diet_map)
-    df['Family_History'] = df['Family_History'].map(binary_map)
-    df['Chronic_Illness'] = df['Chronic_Illness'].map(binary_map)
-    df['Financial_Stress'] = df['Financial_Stress'].apply(clean_numeric_input)
-
-    return df
-
-def preprocess_user_data(user_data):
+        drift_monitor = DriftMonitor.from_reference_dataset()
+    except Exception as e:
+        logger.warning(f"Drift monitoring disabled, could not build baseline: {str(e)}")
+
+# Sorted reference scores for percentile lookups, topped up from stored predictions.
+# Scoring all of Dataset.csv is left to the first use (or warm-up), not import
+score_percentiles = LazyIndex('Score percentiles', lambda: PercentileIndex.from_reference_dataset(
+    backend, MODEL_VERSION, refresh_seconds=settings.PERCENTILE_REFRESH_SECONDS,
+))
+
+# k-NN over Dataset.csv and stored responses for "students like you", also built lazily
+similar_profiles = None
+if settings.SIMILAR_PROFILES_K:
+    similar_profiles = LazyIndex('Similar profiles', lambda: SimilarProfiles.from_reference_dataset(
+        backend, k=settings.SIMILAR_PROFILES_K, refresh_seconds=settings.SIMILAR_PROFILES_REFRESH_SECONDS,
+    ))
+
+# A candidate model scored off the request path on a sample of live submissions
+shadow_evaluator = None
+if settings.SHADOW_MODEL_DIR:
+    try:
+        candidate_backend = get_backend(settings.SHADOW_BACKEND).load(settings.SHADOW_MODEL_DIR)
+        shadow_evaluator = ShadowEvaluator(
+            candidate_backend, artifact_version(settings.SHADOW_MODEL_DIR, candidate_backend),
+            sample_rate=settings.SHADOW_SAMPLE_RATE, queue_size=settings.SHADOW_QUEUE_SIZE,
+        )
+    except Exception as e:
+        logger.warning(f"Shadow mode disabled, could not load candidate model: {str(e)}")
+
+def encode_rows(rows):
+    """Encoded, unscaled feature matrix for a list of answer dicts"""
+    records = [feature_record(user_data) for user_data in rows]
+
+    # Create DataFrame with exactly the expected features in the right order
+    df = pd.DataFrame(records, columns=expected_features)
+    df = manual_encode(df)
+    
+    return df.values.astype(float)
+
+def scale_rows(numpy_data):
+    """Scale and select an encoded feature matrix, observing it for drift"""
+    if drift_monitor is not None:
+        drift_monitor.observe_many(numpy_data)
+    scaled_data = scaler.transform(numpy_data)
+    selected_features = feature_selector.transform(scaled_data)
+    
+    logger.debug(f"Processed data shape: {selected_features.shape}")
+    return selected_features
+
+def feature_record(user_data):
     # Clean all numeric inputs first
     numeric_fields = ['age', 'cgpa', 'semester_credit_load', 'financial_stress']
     for field in numeric_fields:
         user_data[field] = clean_numeric_input(user_data.get(field, 0))
 
-    processed_data = {
+    return {
         'Age': user_data['age'],
         'Course': user_data['course'],
         'Gender': user_data['gender'],
@@ -116,281 +146,403 @@ def preprocess_user_data(user_data):
         'Diet_Quality': user_data['diet_quality'],
         'Financial_Stress': user_data['financial_stress'],
     }
-    
-    # Create DataFrame with exactly the expected features in the right order
-    df = pd.DataFrame([processed_data], columns=expected_features)
-    df = manual_encode(df)
-    
-    numpy_data = df.values.astype(float)
-    scaled_data = scaler.transform(numpy_data)
-    selected_features = feature_selector.transform(scaled_data)
-    
-    logger.debug(f"Processed data shape: {selected_features.shape}")
-    return selected_features
-
-def generate_user_insights(user_data, model):
-    predictions = model.predict(user_data)
-
-    stress_thresholds = [2, 3.5]
-    depression_thresholds = [2, 3.5]
-    anxiety_thresholds = [2, 3.5]
-
-    stress_level = "Low" if predictions[0][0] < stress_thresholds[0] else \
-                  "Moderate" if predictions[0][0] < stress_thresholds[1] else "High"
-
-    depression_level = "Low" if predictions[0][1] < depression_thresholds[0] else \
-                      "Moderate" if predictions[0][1] < depression_thresholds[1] else "High"
-
-    anxiety_level = "Low" if predictions[0][2] < anxiety_thresholds[0] else \
-                   "Moderate" if predictions[0][2] < anxiety_thresholds[1] else "High"
 
-    def get_stress_recommendations(stress_level, user_data):
-        if stress_level == "High":
-            return [
-                "Practice mindfulness and relaxation techniques",
-                "Consider seeking professional help",
-                "Prioritize sleep and healthy eating",
-                "Take regular breaks during work/study (5 min every hour)"
-            ]
-        elif stress_level == "Moderate":
-            return [
-                "Maintain a healthy lifestyle with balanced diet and regular exercise",
-                "Practice daily mindfulness or meditation (10-15 minutes)",
-                "Establish a consistent sleep schedule (7-9 hours)",
-                "Connect with friends and family"
-            ]
-        else:
-            return [
-                "Continue with stress-reducing activities",
-                "Practice gratitude journaling (3 things daily)",
-                "Engage in regular physical activity",
-                "Maintain work-life balance"
-            ]
-
-    def get_depression_recommendations(depression_level, user_data):
-        if depression_level == "High":
-            return [
-                "Seek professional help immediately",
-                "Prioritize sleep and healthy eating",
-                "Engage in activities you enjoy",
-                "Connect with support groups or trusted friends"
-            ]
-        elif depression_level == "Moderate":
-            return [
-                "Consider talking to a therapist or counselor",
-                "Establish a daily routine with achievable goals",
-                "Practice self-care activities",
-                "Try progressive muscle relaxation techniques"
-            ]
-        else:
-            return [
-                "Maintain a positive outlook",
-                "Continue with activities that promote mental well-being",
-                "Practice gratitude journaling (3 things daily)",
-                "Engage in social activities"
-            ]
-
-    def get_anxiety_recommendations(anxiety_level, user_data):
-        if anxiety_level == "High":
-            return [
-                "Consult with a mental health professional",
-                "Practice deep breathing exercises (4-7-8 technique)",
-                "Limit caffeine and alcohol intake",
-                "Establish a worry time (15-20 minutes scheduled)"
-            ]
-        elif anxiety_level == "Moderate":
-            return [
-                "Engage in relaxation techniques",
-                "Challenge negative thoughts",
-                "Consider joining a support group",
-                "Try progressive muscle relaxation techniques"
-            ]
-        else:
-            return [
-                "Maintain a healthy lifestyle",
-                "Continue with anxiety-reducing practices",
-                "Practice mindfulness exercises",
-                "Establish a consistent daily routine"
-            ]
-
-    insights = {
-        'stress': {
-            'score': float(predictions[0][0]),
-            'level': stress_level,
-            'recommendations': get_stress_recommendations(stress_level, user_data)
-        },
-        'depression': {
-            'score': float(predictions[0][1]),
-            'level': depression_level,
-            'recommendations': get_depression_recommendations(depression_level, user_data)
-        },
-        'anxiety': {
-            'score': float(predictions[0][2]),
-            'level': anxiety_level,
-            'recommendations': get_anxiety_recommendations(anxiety_level, user_data)
-        }
-    }
-
-    return insights
+def generate_user_insights(prediction):
+    # Levels and recommendations come from the rule table in insights.py
+    return build_insights(prediction[0])
 
 
 def generate_explanation(prediction):
     try:
-        stress, depression, anxiety = prediction[0]
-        explanations = []
-
-        if stress >= 4:
-            explanations.append("High stress level detected - consider stress management techniques such as mindfulness, exercise, or counseling.")
-            explanations.append("Chronic high stress can impact physical health - monitor blood pressure and sleep patterns regularly.")
-            explanations.append("Consider identifying specific stress triggers through journaling to better manage them.")
-        elif stress >= 2:
-            explanations.append("Moderate stress level - monitor your stress regularly and try healthy coping mechanisms.")
-            explanations.append("Even moderate stress can accumulate - schedule regular relaxation breaks throughout your day.")
-            explanations.append("Physical activity like walking or yoga can help moderate stress levels effectively.")
-        else:
-            explanations.append("Your stress level appears within the normal range.")
-            explanations.append("Maintaining healthy habits will help keep your stress levels in check.")
-            explanations.append("Regular self-check-ins can help detect early signs of increasing stress.")
-
-        if depression >= 4:
-            explanations.append("High depression score - seeking support from a mental health professional is recommended.")
-            explanations.append("Persistent depression may affect daily functioning - consider reaching out to support networks.")
-            explanations.append("Small, manageable goals can help create positive momentum when dealing with depression.")
-        elif depression >= 2:
-            explanations.append("Moderate depression score - be aware of changes in mood and talk to someone you trust.")
-            explanations.append("Maintaining social connections can help prevent moderate depression from worsening.")
-            explanations.append("Morning sunlight exposure and regular sleep patterns may help improve mood.")
-        else:
-            explanations.append("Your depression score appears within the normal range.")
-            explanations.append("Continuing to engage in meaningful activities supports mental wellbeing.")
-            explanations.append("Regular mood check-ins can help maintain emotional balance.")
-
-        if anxiety >= 4:
-            explanations.append("High anxiety score - relaxation techniques or speaking to a counselor may help.")
-            explanations.append("For acute anxiety, grounding techniques like 5-4-3-2-1 can provide immediate relief.")
-            explanations.append("Consider limiting caffeine and creating predictable routines to reduce anxiety triggers.")
-        elif anxiety >= 2:
-            explanations.append("Moderate anxiety score - try to manage your triggers and seek support if needed.")
-            explanations.append("Breathing exercises practiced daily can help regulate moderate anxiety responses.")
-            explanations.append("Scheduling 'worry time' can contain anxious thoughts to specific periods.")
-        else:
-            explanations.append("Your anxiety score appears within the normal range.")
-            explanations.append("Maintaining regular relaxation practices can help prevent anxiety buildup.")
-            explanations.append("Being aware of physical tension can help catch early signs of anxiety.")
-
-        return {"explanations": explanations}
+        return {"explanations": build_explanations(prediction[0])}
     except Exception as e:
         logger.error(f"Explanation generation error: {str(e)}")
         return {"explanations": [f"Could not generate explanations: {str(e)}"]}
 
+def generate_contributions(processed_data, top=None):
+    """Answers that pushed each score up or down, or None when the backend can't explain"""
+    if explainer is None:
+        return None
+    contributions = {}
+    for key, target in explainer.explain(processed_data).items():
+        items = list(target['contributions'].items())[:top]
+        contributions[key] = {
+            'baseline': target['baseline'],
+            'factors': [
+                {
+                    'field': field,
+                    'label': MentalHealthForm.base_fields[field].label,
+                    'value': value,
+                }
+                for field, value in items
+            ],
+        }
+    return contributions
+
+def rate_limited(response, retry_after):
+    response['Retry-After'] = str(retry_after)
+    return response
+
+def too_large(error):
+    """A request bigger than its rate-limit budget: retrying cannot help, so no Retry-After"""
+    return JsonResponse({'status': 'error', 'message': str(error)}, status=413)
+
+def generate_percentiles(prediction, user_data):
+    """Where each score falls among students overall and in the same Course and Gender"""
+    index = score_percentiles.get()
+    if index is None:
+        return None
+    return index.rank(
+        prediction[0],
+        course=encode(Course, user_data['course']),
+        gender=encode(Gender, user_data['gender']),
+    )
+
+def shadow_score(encoded, prediction, started):
+    """
+    Hand encoded rows and their served scores to the shadow candidate, never
+    waiting on it. `started` is the perf_counter() taken before scaling them.
+    """
+    if shadow_evaluator is not None:
+        shadow_evaluator.submit(encoded, prediction, (time.perf_counter() - started) * 1000.0)
+
+def generate_similar_profiles(processed_data):
+    """Aggregate outcomes of the most similar students, or None when unavailable"""
+    index = similar_profiles.get() if similar_profiles is not None else None
+    if index is None:
+        return None
+    return index.query(processed_data)
+
 def home(request):
     if request.method == 'POST':
+        # A resubmitted form (double click, refresh) gets the first submission's result back
+        submission = claim(
+            request, 'assessment', request.POST.get(SUBMISSION_TOKEN_FIELD), form_fingerprint(request.POST),
+        )
+        if submission.result is not None:
+            return redirect('result', result_id=submission.result)
+        if submission.in_progress:
+            return render(request, 'error.html', {
+                'error_message': "This assessment is still being processed. Please refresh in a moment."
+            }, status=409)
+
         form = MentalHealthForm(request.POST)
         if form.is_valid():
+            # Only scored submissions are charged: fixing a rejected form costs nothing
+            retry_after = check_rate_limit(request, 'single')
+            if retry_after is not None:
+                submission.release()
+                return rate_limited(render(request, 'error.html', {
+                    'error_message': "Too many assessments submitted. Please wait a moment and try again."
+                }, status=429), retry_after)
+
             try:
                 user_data = form.cleaned_data
                 logger.debug(f"Form data received: {user_data}")
                 
-                processed_data = preprocess_user_data(user_data)
-                prediction = ada_model.predict(processed_data)
+                encoded = encode_rows([user_data])
+                started = time.perf_counter()
+                processed_data = scale_rows(encoded)
+                prediction = predictor(request).predict(processed_data)
+                shadow_score(encoded, prediction, started)
 
-                insights = generate_user_insights(processed_data, ada_model)
-                explanation = generate_explanation(prediction)
+                result = {
+                    'prediction': prediction.tolist(),
+                    'insights': generate_user_insights(prediction),
+                    'explanation': generate_explanation(prediction),
+                    'contributions': generate_contributions(processed_data, top=3),
+                    'percentiles': generate_percentiles(prediction, user_data),
+                    'similar': generate_similar_profiles(processed_data),
+                    'user_data': user_data
+                }
 
+                result_id = None
                 if request.user.is_authenticated:
                     try:
-                        # Convert all numeric fields to proper types
-                        user_response = UserResponse(
-                            user=request.user,
-                            age=float(user_data['age']),
-                            gender=user_data['gender'],
-                            cgpa=float(user_data['cgpa']),
-                            semester_credit_load=float(user_data['semester_credit_load']),
-                            sleep_quality=user_data['sleep_quality'],
-                            physical_activity=user_data['physical_activity'],
-                            diet_quality=user_data['diet_quality'],
-                            social_support=user_data['social_support'],
-                            relationship_status=user_data['relationship_status'],
-                            financial_stress=float(user_data['financial_stress']),
-                            substance_use=user_data['substance_use'],
-                            counseling_service_use=user_data['counseling_service_use'],
-                            family_history=user_data['family_history'],
-                            chronic_illness=user_data['chronic_illness'],
-                            extracurricular_involvement=user_data['extracurricular_involvement'],
-                            residence_type=user_data['residence_type']
-                        )
-                        
-                        user_response.save()
-
-                        prediction_obj = Prediction(
-                            user_response=user_response,
-                            stress_level=float(prediction[0][0]),
-                            depression_score=float(prediction[0][1]),
-                            anxiety_score=float(prediction[0][2]),
-                        )
-                        prediction_obj.save()
+                        with transaction.atomic():
+                            # Categorical answers are stored as their integer codes
+                            user_response = UserResponse.from_form_data(
+                                user_data, user=request.user, submission_key=submission.digest,
+                            )
+                            user_response.save()
+
+                            prediction_obj = Prediction(
+                                user_response=user_response,
+                                stress_level=float(prediction[0][0]),
+                                depression_score=float(prediction[0][1]),
+                                anxiety_score=float(prediction[0][2]),
+                                model_version=MODEL_VERSION,
+                            )
+                            prediction_obj.save()
+                            result_id = store_result(result, user_response)
+                    except IntegrityError:
+                        # Another worker already stored this submission: show its result
+                        logger.info(f"Duplicate submission {submission.digest} not stored again")
+                        result_id = find_result(request.user, submission.digest)
                     except Exception as e:
                         logger.error(f"Error saving user response: {str(e)}")
                         # Add this line to see more details about the error
                         logger.error(f"Error details: {str(e.__dict__)}")
+                if result_id is None:
+                    # No stored response to attach it to: the result expires like an anonymous
+                    # one, but stays restricted to the user who submitted it
+                    result_id = store_result(result, owner=request.user.pk)
 
-                return render(request, 'result.html', {
-                    'prediction': prediction.tolist(),
-                    'insights': insights,
-                    'explanation': explanation,
-                    'user_data': user_data
-                })
+                # Post/Redirect/Get: refreshing the result page re-reads it instead of resubmitting
+                submission.complete(result_id)
+                return redirect('result', result_id=result_id)
 
             except Exception as e:
                 logger.error(f"Prediction error: {str(e)}", exc_info=True)
+                submission.release()
                 return render(request, 'error.html', {
                     'error_message': "An error occurred during processing. Please check your inputs and try again."
                 })
+        submission.release()
     else:
         form = MentalHealthForm()
-    return render(request, 'index.html', {'form': form})
+    return render(request, 'index.html', {
+        'form': form,
+        'submission_token': request.POST.get(SUBMISSION_TOKEN_FIELD) or new_submission_token(),
+    })
+
+def result_view(request, result_id):
+    """
+    A stored result page. Revisits are rendered from the cached or stored
+    context, never re-scored, and browsers may reuse or revalidate them.
+    """
+    entry = load_result(result_id)
+    if entry is None or not can_view(request, entry):
+        return render(request, 'error.html', {
+            'error_message': "This result is no longer available. Please take the assessment again."
+        }, status=404)
+
+    # The page embeds the user's navbar and CSRF token, so both are part of its version
+    version = f"{result_id}:{request.user.pk}:{request.META.get('CSRF_COOKIE', '')}"
+    etag = f'"{hashlib.sha256(version.encode()).hexdigest()[:20]}"'
+    last_modified = int(entry['created_at'].timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = render(request, 'result.html', entry['context'])
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=settings.RESULT_PAGE_MAX_AGE)
+    patch_vary_headers(response, ['Cookie'])
+    return response
 
 def predict_api(request):
+    """
+    Score one JSON object, or a JSON array of them in a single vectorized
+    predict. Payloads are checked against the form-derived schema first, so
+    bad answers get per-field errors instead of failing inside the model.
+
+    A retried request with the same Idempotency-Key header and body gets the
+    first successful response back without being scored again.
+    """
+    if request.method != 'POST':
+        return predict_response(request)
+
+    submission = claim(request, 'predict', request.META.get(IDEMPOTENCY_HEADER), request.body)
+    if submission.result is not None:
+        response = HttpResponse(submission.result, content_type='application/json')
+        response['Idempotent-Replayed'] = 'true'
+        return response
+    if submission.in_progress:
+        return JsonResponse({
+            'status': 'error', 'message': 'A request with this Idempotency-Key is still being processed',
+        }, status=409)
+
+    response = predict_response(request)
+    if response.status_code == 200:
+        submission.complete(response.content)
+    else:
+        submission.release()
+    return response
+
+def predict_response(request):
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
-            user_data = {
-                'age': float(data.get('age')),
-                'gender': data.get('gender'),
-                'cgpa': float(data.get('cgpa')),
-                'semester_credit_load': float(data.get('semester_credit_load')),
-                'sleep_quality': data.get('sleep_quality'),
-                'physical_activity': data.get('physical_activity'),
-                'diet_quality': data.get('diet_quality'),
-                'social_support': data.get('social_support'),
-                'relationship_status': data.get('relationship_status'),
-                'financial_stress': float(data.get('financial_stress')),
-                'substance_use': data.get('substance_use'),
-                'counseling_service_use': data.get('counseling_service_use'),
-                'extracurricular_involvement': data.get('extracurricular_involvement'),
-                'residence_type': data.get('residence_type'),
-                'family_history': data.get('family_history'),
-                'chronic_illness': data.get('chronic_illness'),
-                'course': data.get('course'),
-            }
-            processed_data = preprocess_user_data(user_data)
-            prediction = ada_model.predict(processed_data)
-
-            insights = generate_user_insights(processed_data, ada_model)
-            explanation = generate_explanation(prediction)
-
-            return JsonResponse({
-                'status': 'success',
-                'prediction': prediction.tolist(),
-                'insights': insights,
-                'explanation': explanation
-            })
+            if isinstance(data, list):
+                return predict_batch(request, data)
+
+            retry_after = check_rate_limit(request, 'single')
+            if retry_after is not None:
+                return rate_limited(
+                    JsonResponse({'status': 'error', 'message': 'Rate limit exceeded'}, status=429), retry_after,
+                )
+
+            user_data, errors = prediction_schema.validate(data)
+            if errors:
+                return JsonResponse({'status': 'error', 'message': 'Invalid input', 'errors': errors}, status=400)
+            encoded = encode_rows([user_data])
+            started = time.perf_counter()
+            processed_data = scale_rows(encoded)
+            prediction = predictor(request).predict(processed_data)
+            shadow_score(encoded, prediction, started)
+
+            # Insight and explanation text is pre-encoded; only the scores are serialized here
+            extra = {}
+            # Per-answer contributions are opt-in so existing clients see the same payload
+            if data.get('explain'):
+                extra['contributions'] = generate_contributions(processed_data)
+            if data.get('percentiles'):
+                extra['percentiles'] = generate_percentiles(prediction, user_data)
+            if data.get('similar'):
+                extra['similar'] = generate_similar_profiles(processed_data)
+
+            return HttpResponse(encode_prediction_response(prediction, **extra), content_type='application/json')
 
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     else:
         return JsonResponse({'error': 'Invalid request method'}, status=400)
 
+def predict_batch(request, rows):
+    if not 1 <= len(rows) <= settings.PREDICT_API_MAX_BATCH_SIZE:
+        return JsonResponse({
+            'status': 'error',
+            'message': f"Batch must contain between 1 and {settings.PREDICT_API_MAX_BATCH_SIZE} rows",
+        }, status=400)
+
+    # Batches spend their own budget, one token per row
+    try:
+        retry_after = check_rate_limit(request, 'batch', cost=len(rows))
+    except CostExceedsBurst as e:
+        return too_large(e)
+    if retry_after is not None:
+        return rate_limited(
+            JsonResponse({'status': 'error', 'message': 'Rate limit exceeded'}, status=429), retry_after,
+        )
+
+    # Every row is validated before any is encoded, so one bad row rejects the batch
+    cleaned_rows, errors = prediction_schema.validate_many(rows)
+    if errors:
+        return JsonResponse({'status': 'error', 'message': 'Invalid input', 'errors': errors}, status=400)
+
+    encoded = encode_rows(cleaned_rows)
+    started = time.perf_counter()
+    processed_data = scale_rows(encoded)
+    predictions = predictor(request).predict(processed_data)
+    shadow_score(encoded, predictions, started)
+
+    results = []
+    for i, row in enumerate(rows):
+        extra = {}
+        if row.get('explain'):
+            extra['contributions'] = generate_contributions(processed_data[i:i + 1])
+        if row.get('percentiles'):
+            extra['percentiles'] = generate_percentiles(predictions[i:i + 1], cleaned_rows[i])
+        if row.get('similar'):
+            extra['similar'] = generate_similar_profiles(processed_data[i:i + 1])
+        results.append(encode_prediction_response(predictions[i:i + 1], **extra))
+    return HttpResponse(
+        b'{"status": "success", "results": [' + b', '.join(results) + b']}',
+        content_type='application/json',
+    )
+
+def what_if_api(request):
+    """
+    Score a base profile with some answers varied: every combination of the
+    "vary" values becomes one row of a single matrix, scored in one predict
+    call. Returns each variant's scores and their change from the base.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method'}, status=400)
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            return JsonResponse({'status': 'error', 'message': 'Expected a JSON object'}, status=400)
+        base, errors = prediction_schema.validate(data.get('profile'))
+        vary, vary_errors = parse_vary(data.get('vary'), prediction_schema, settings.WHATIF_MAX_VARIANTS)
+        if errors or vary_errors:
+            return JsonResponse({
+                'status': 'error', 'message': 'Invalid input',
+                'errors': {'profile': errors, 'vary': vary_errors},
+            }, status=400)
+
+        size = grid_size(vary)
+        if size > settings.WHATIF_MAX_VARIANTS:
+            return JsonResponse({
+                'status': 'error',
+                'message': f"{size} variants requested, the limit is {settings.WHATIF_MAX_VARIANTS}",
+            }, status=400)
+        # Each variant is a scored row, so the grid spends the batch budget
+        try:
+            retry_after = check_rate_limit(request, 'batch', cost=size)
+        except CostExceedsBurst as e:
+            return too_large(e)
+        if retry_after is not None:
+            return rate_limited(
+                JsonResponse({'status': 'error', 'message': 'Rate limit exceeded'}, status=429), retry_after,
+            )
+
+        # Row 0 is the unchanged profile; counterfactuals bypass the drift monitor
+        variants = expand_grid(vary)
+        matrix = variant_matrix(encode_rows([base])[0], [{}] + variants)
+        scores = predictor(request).predict(transform_features(matrix))
+
+        base_scores = scores[0]
+        return JsonResponse({
+            'status': 'success',
+            'base': dict(zip(TARGET_KEYS, map(float, base_scores))),
+            'variants': [
+                {
+                    'changes': changes,
+                    'scores': dict(zip(TARGET_KEYS, map(float, row))),
+                    'deltas': dict(zip(TARGET_KEYS, map(float, row - base_scores))),
+                }
+                for changes, row in zip(variants, scores[1:])
+            ],
+        })
+
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+@staff_member_required
+def inference_metrics(request):
+    if isinstance(inference_model, MicroBatcher):
+        return JsonResponse({'batching': True, **inference_model.stats()})
+    return JsonResponse({'batching': False})
+
+@staff_member_required
+def drift_metrics(request):
+    if drift_monitor is None:
+        return JsonResponse({'enabled': False})
+    return JsonResponse({'enabled': True, **drift_monitor.snapshot()})
+
+@staff_member_required
+def similar_profiles_metrics(request):
+    index = similar_profiles.get() if similar_profiles is not None else None
+    if index is None:
+        return JsonResponse({'enabled': False})
+    return JsonResponse({'enabled': True, **index.stats()})
+
+@staff_member_required
+def shadow_metrics(request):
+    if shadow_evaluator is None:
+        return JsonResponse({'enabled': False})
+    return JsonResponse({'enabled': True, **shadow_evaluator.stats()})
+
+def healthz(request):
+    return JsonResponse({'status': 'ok'})
+
+def readyz(request):
+    if not settings.WARMUP_ON_STARTUP:
+        return JsonResponse({'ready': True})
+    state = warmup.status()
+    if not state['ready']:
+        # Retry a failed warm-up, e.g. when the database was not up yet
+        warmup.start()
+    return JsonResponse(state, status=200 if state['ready'] else 503)
+
+@staff_member_required
+def profile_report(request, profile_id):
+    report = cache.get(profile_cache_key(profile_id))
+    if report is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown or expired profile'}, status=404)
+    return JsonResponse(report)
+
 def logout_view(request):
     logout(request)
     return redirect('home')
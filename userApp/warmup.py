@@ -0,0 +1,133 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {'ready': False, 'running': False, 'seconds': None, 'error': None}
+_idle = threading.Event()
+_idle.set()
+# How long a fork (gunicorn --preload spawning workers) waits for a warm-up in progress
+FORK_WAIT_SECONDS = 30
+
+
+def _before_fork():
+    # A child forked mid-warm-up would inherit half-imported modules and a
+    # running flag with no thread behind it, so let the warm-up finish first
+    _idle.wait(FORK_WAIT_SECONDS)
+
+
+def _after_fork_in_child():
+    global _lock, _idle
+    _lock = threading.Lock()
+    _idle = threading.Event()
+    _idle.set()
+    _state['running'] = False
+
+
+os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+
+
+def serving():
+    """True unless the process is running a manage.py command other than runserver"""
+    if not sys.argv or not sys.argv[0].endswith('manage.py'):
+        return True
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    # The autoreloader's parent process only watches files
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+
+
+def status():
+    with _lock:
+        return dict(_state)
+
+
+def start():
+    """Run warm_up() on a daemon thread unless it is running or has succeeded"""
+    with _lock:
+        if _state['ready'] or _state['running']:
+            return
+        _state['running'] = True
+        _idle.clear()
+    threading.Thread(target=_run, daemon=True, name='warmup').start()
+
+
+def _run():
+    started = time.perf_counter()
+    error = None
+    try:
+        warm_up()
+    except Exception as e:
+        error = str(e)
+        logger.error(f"Warm-up failed: {error}", exc_info=True)
+    finally:
+        # No request cycle closes this thread's database connection
+        connections.close_all()
+    seconds = time.perf_counter() - started
+    with _lock:
+        _state.update(ready=error is None, running=False, seconds=seconds, error=error)
+        _idle.set()
+    if error is None:
+        logger.info(f"Warm-up finished in {seconds:.2f}s")
+
+
+def synthetic_profile():
+    """Form answers for the first complete Dataset.csv row"""
+    from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS
+    from .datasets import load_reference_dataset
+
+    features, _ = load_reference_dataset()
+    row = features.iloc[0]
+    profile = {}
+    for feature, field in FEATURE_FIELDS.items():
+        value = row[feature]
+        if field in CATEGORICAL_FIELDS:
+            value = CATEGORICAL_FIELDS[field](int(value)).label
+        profile[field] = value
+    return profile
+
+
+def warm_up():
+    """
+    Pay the first-request costs up front: import and build the model and
+    lookup indexes, run one synthetic prediction through the same steps as
+    the home view (without counting it in drift or batching stats), compile
+    the main templates and run one query. The query's connection belongs to
+    this thread and is closed afterwards; it warms the ORM and the database
+    (and fails the warm-up while the database is down), but request threads
+    still open their own connections, kept for DB_CONN_MAX_AGE.
+    """
+    from django.contrib.auth.models import AnonymousUser
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from . import views
+    from .forms import MentalHealthForm
+    from .insights import encode_prediction_response
+    from .models import UserResponse
+
+    user_data = synthetic_profile()
+    processed_data = views.transform_features(views.encode_rows([dict(user_data)]))
+    prediction = views.model.predict(processed_data)
+    encode_prediction_response(prediction)
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    render_to_string('index.html', {'form': MentalHealthForm()}, request=request)
+    render_to_string('result.html', {
+        'prediction': prediction.tolist(),
+        'insights': views.generate_user_insights(prediction),
+        'explanation': views.generate_explanation(prediction),
+        'contributions': views.generate_contributions(processed_data, top=3),
+        'percentiles': views.generate_percentiles(prediction, user_data),
+        'similar': views.generate_similar_profiles(processed_data),
+        'user_data': user_data,
+    }, request=request)
+
+    UserResponse.objects.exists()
@@ -0,0 +1,67 @@
+import itertools
+
+import numpy as np
+
+from .choices import CATEGORICAL_FIELDS, FEATURE_FIELDS, encode
+
+# Form field name -> column in the encoded feature matrix
+FEATURE_COLUMNS = {field: i for i, field in enumerate(FEATURE_FIELDS.values())}
+
+
+def parse_vary(spec, schema, max_values):
+    """
+    Validated {field: [values]} from a what-if request's "vary" object.
+    An empty list or null for a categorical field means every choice.
+    Lists longer than `max_values` are rejected before their values are
+    checked. Returns (vary, errors) with errors keyed by field.
+    """
+    if not isinstance(spec, dict) or not spec:
+        return None, {'vary': "Expected an object mapping fields to lists of values."}
+    vary, errors = {}, {}
+    for field, values in spec.items():
+        if field not in FEATURE_COLUMNS:
+            errors[field] = "Unknown field."
+            continue
+        if not values:
+            if field not in CATEGORICAL_FIELDS:
+                errors[field] = "List the values to try for a numeric field."
+                continue
+            values = [label for _, label in CATEGORICAL_FIELDS[field].choices]
+        if not isinstance(values, list):
+            errors[field] = "Expected a list of values."
+            continue
+        if len(values) > max_values:
+            errors[field] = f"At most {max_values} values."
+            continue
+        cleaned = []
+        for value in values:
+            value, error = schema.validators[field](value)
+            if error:
+                errors[field] = error
+                break
+            cleaned.append(value)
+        vary[field] = list(dict.fromkeys(cleaned))
+    return vary, errors
+
+
+def expand_grid(vary):
+    """Every combination of the varied values, as a list of {field: value} changes"""
+    fields = list(vary)
+    return [dict(zip(fields, combination)) for combination in itertools.product(*vary.values())]
+
+
+def grid_size(vary):
+    size = 1
+    for values in vary.values():
+        size *= len(values)
+    return size
+
+
+def variant_matrix(base_row, variants):
+    """The encoded base row repeated once per variant with that variant's changes applied"""
+    matrix = np.repeat(np.asarray(base_row, dtype=float).reshape(1, -1), len(variants), axis=0)
+    for i, changes in enumerate(variants):
+        for field, value in changes.items():
+            choices = CATEGORICAL_FIELDS.get(field)
+            matrix[i, FEATURE_COLUMNS[field]] = encode(choices, value) if choices else value
+    return matrix